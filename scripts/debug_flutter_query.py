@@ -4,6 +4,7 @@ Debug script to simulate the exact Flutter query that's failing
 """
 
 import sys
+import asyncio
 import os
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'services', 'api'))
 
@@ -93,7 +94,7 @@ def debug_flutter_query():
     q = Query(text=query, location=location, crop=crop)
     
     try:
-        result = _run_query(q)
+        result = asyncio.run(_run_query(q))
         
         final_answer = result.get('answer', '')
         final_confidence = result.get('confidence', 0.0)
@@ -0,0 +1,28 @@
+#!/usr/bin/env python3
+"""
+Export the embedding model to ONNX with dynamic int8 quantization.
+Point EMBEDDING_ONNX_DIR at the output directory to serve it from the API.
+
+Requires: pip install "optimum[onnxruntime]"
+"""
+
+import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'services', 'api'))
+from app.onnx_embedder import export_quantized_model
+
+
+def main():
+    model_name = sys.argv[1] if len(sys.argv) > 1 else os.getenv("EMBEDDING_MODEL", "all-MiniLM-L6-v2")
+    output_dir = sys.argv[2] if len(sys.argv) > 2 else os.path.join("models", "embedder-onnx-int8")
+    if "/" not in model_name:
+        model_name = f"sentence-transformers/{model_name}"
+    print(f'📦 Exporting {model_name} to {output_dir}...')
+    path = export_quantized_model(model_name, output_dir)
+    print(f'✅ Quantized model written to {path}')
+    print(f'   Set EMBEDDING_ONNX_DIR={output_dir} to use it')
+
+
+if __name__ == "__main__":
+    main()
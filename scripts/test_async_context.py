@@ -21,9 +21,9 @@ async def test_in_async_context():
         
         # This simulates what happens when FastAPI calls the supervisor
         print('🔍 Testing subsidy query in async context...')
-        result = supervisor.process_query('What subsidies are available for farmers?', 'Maharashtra', 'wheat')
+        result = await supervisor.aprocess_query('What subsidies are available for farmers?', 'Maharashtra', 'wheat')
         
-        print('✅ SUCCESS! No asyncio.run() error in async context')
+        print('✅ SUCCESS! Awaited from an async context')
         print(f'Answer: {result["answer"][:150]}...')
         print(f'Workflow: {result.get("workflow_trace", "unknown")}')
         print(f'Agent Used: {result.get("agent_used", "unknown")}')
@@ -39,7 +39,7 @@ async def test_in_async_context():
         print('\n🔍 Testing multiple queries in sequence...')
         for i, query in enumerate(test_queries, 1):
             print(f'\n🧪 Query {i}: {query}')
-            result = supervisor.process_query(query, 'Punjab', 'wheat')
+            result = await supervisor.aprocess_query(query, 'Punjab', 'wheat')
             workflow = result.get("workflow_trace", "unknown")
             print(f'✅ Success! Workflow: {workflow}')
         
@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""
+Test script to verify the Aho-Corasick and regex keyword matchers agree
+"""
+
+import sys
+import os
+from collections import Counter
+
+# Add the API directory to the path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'services', 'api'))
+
+TEST_QUERIES = [
+    ('will there be rainfall this week', {'weather': 1}),
+    ('best time for planting wheat', {'crop': 1}),
+    ('selling price of onion in the mandi', {'finance': 3}),
+    ('heat wave forecast and irrigation schedule', {'weather': 3}),
+    ('how to apply for pm kisan and kisan credit card', {'policy': 4}),
+    ('wheat seed variety', {'crop': 2}),
+    ('rain rain rainy', {'weather': 3}),
+    ('hello there', {}),
+]
+
+
+def test_intent_matcher():
+    """Both matcher backends must report the same hits"""
+    print('🧪 Testing Intent Keyword Matchers...')
+    print('=' * 50)
+
+    from app.intent_matcher import build_intent_matcher, ahocorasick
+    if ahocorasick is None:
+        print('⚠️ pyahocorasick not installed; only the regex matcher is checked')
+    automaton_match = build_intent_matcher(use_automaton=True)
+    regex_match = build_intent_matcher(use_automaton=False)
+
+    passed = True
+    for query, expected in TEST_QUERIES:
+        from_automaton = Counter(tag for tag, _ in automaton_match(query))
+        from_regex = Counter(tag for tag, _ in regex_match(query))
+        ok = automaton_match(query) == regex_match(query) and from_automaton == Counter(expected)
+        passed = passed and ok
+        print(f'{"✅" if ok else "❌"} {query!r}: automaton={dict(from_automaton)} regex={dict(from_regex)}')
+
+    print('\n🎉 ALL TESTS PASSED!' if passed else '\n❌ Matchers disagree')
+    return passed
+
+
+if __name__ == "__main__":
+    sys.exit(0 if test_intent_matcher() else 1)
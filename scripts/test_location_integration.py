@@ -4,6 +4,7 @@ Test the complete location integration fix
 """
 
 import sys
+import asyncio
 import os
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'services', 'api'))
 
@@ -48,7 +49,7 @@ def test_location_scenarios():
                 crop=test_case['crop']
             )
             
-            result = _run_query(q)
+            result = asyncio.run(_run_query(q))
             
             answer = result.get('answer', '')
             confidence = result.get('confidence', 0.0)
@@ -5,12 +5,12 @@ Crop Agent for crop-specific agricultural advice
 from typing import Dict, List, Any, Optional
 from datetime import datetime
 
-from ..llm_client import LLMClient
+from ..llm_client import get_llm_client
 
 class CropAgent:
     def __init__(self):
         self.name = "crop_agent"
-        self.llm_client = LLMClient()
+        self.llm_client = get_llm_client()
     
     def process_query(self, query: str, location: str = None, crop: str = None, context: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """Process crop-related queries"""
@@ -8,7 +8,7 @@ from datetime import datetime
 import json
 import os
 import re
-from ..llm_client import LLMClient
+from ..llm_client import get_llm_client
 from ..finance_session import finance_session_manager
 
 
@@ -17,7 +17,7 @@ class FinanceAgent:
         self.name = "finance_agent"
         self.crop_prices = self._load_crop_prices()
         self.financial_parameters = self._get_financial_parameters_template()
-        self.llm_client = LLMClient()
+        self.llm_client = get_llm_client()
     
     def _load_crop_prices(self) -> Dict[str, Any]:
         """Load crop price data (placeholder until you add real data)"""
@@ -554,8 +554,8 @@ Format as a numbered list of clear, direct questions.
         try:
             session = finance_session_manager.get_session_data(session_id)
             if session:
-                all_financial_data = session["financial_data"]
-                form_completed = session["form_completed"]
+                all_financial_data = session.financial_data
+                form_completed = session.form_completed
             else:
                 # Fallback if session doesn't work
                 all_financial_data = extracted_data
@@ -21,15 +21,15 @@ class WeatherAgent:
         if self.llm_client is None:
             try:
                 # Import here to avoid circular imports
-                from ..llm_client import LLMClient
-                self.llm_client = LLMClient()
+                from ..llm_client import get_llm_client
+                self.llm_client = get_llm_client()
             except ImportError:
                 try:
                     import sys
                     import os
                     sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-                    from llm_client import LLMClient
-                    self.llm_client = LLMClient()
+                    from llm_client import get_llm_client
+                    self.llm_client = get_llm_client()
                 except ImportError:
                     print("Warning: LLM client not available, using fallback analysis")
                     self.llm_client = None
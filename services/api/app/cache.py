@@ -13,6 +13,11 @@ try:
 except ImportError:
     redis = None
 
+try:
+    import xxhash
+except ImportError:
+    xxhash = None
+
 logger = logging.getLogger(__name__)
 
 class CacheService:
@@ -45,10 +50,12 @@ class CacheService:
     
     def _generate_cache_key(self, prefix: str, **kwargs) -> str:
         """Generate a consistent cache key from parameters"""
-        # Sort kwargs for consistent hashing
-        sorted_params = sorted(kwargs.items())
-        param_str = json.dumps(sorted_params, sort_keys=True)
-        param_hash = hashlib.md5(param_str.encode()).hexdigest()[:8]
+        # Sort kwargs for consistent hashing; \x1f keeps fields from running together
+        param_str = "\x1f".join(f"{k}={v}" for k, v in sorted(kwargs.items())).encode()
+        if xxhash is not None:
+            param_hash = xxhash.xxh3_64_hexdigest(param_str)
+        else:
+            param_hash = hashlib.blake2b(param_str, digest_size=8).hexdigest()
         return f"{prefix}:{param_hash}"
     
     def get(self, key: str) -> Optional[Any]:
@@ -5,11 +5,32 @@ Manages financial information across multiple interactions
 
 from typing import Dict, List, Any, Optional
 from datetime import datetime, timedelta
+from dataclasses import dataclass, field
 import json
 import os
 import uuid
 
 
+# Fields required before a comprehensive financial analysis can run
+_CRITICAL_FIELDS_ORDERED = (
+    "land_size_acres",
+    "annual_production",
+    "fertilizer_cost",
+    "water_cost"
+)
+_CRITICAL_FIELDS = frozenset(_CRITICAL_FIELDS_ORDERED)
+
+@dataclass(slots=True)
+class SessionState:
+    """Per-user finance session state"""
+    created_at: datetime
+    last_updated: datetime
+    financial_data: Dict[str, Any] = field(default_factory=dict)
+    conversation_history: List[Dict[str, Any]] = field(default_factory=list)
+    form_completed: bool = False
+    missing_fields: List[Dict[str, str]] = field(default_factory=list)
+
+
 class FinanceSessionManager:
     """Manages user financial data sessions"""
     
@@ -23,14 +44,8 @@ class FinanceSessionManager:
             user_id = str(uuid.uuid4())[:8]  # Generate session ID
         
         if user_id not in self.sessions:
-            self.sessions[user_id] = {
-                "created_at": datetime.now(),
-                "last_updated": datetime.now(),
-                "financial_data": {},
-                "conversation_history": [],
-                "form_completed": False,
-                "missing_fields": []
-            }
+            now = datetime.now()
+            self.sessions[user_id] = SessionState(created_at=now, last_updated=now)
         
         return user_id
     
@@ -42,24 +57,25 @@ class FinanceSessionManager:
         session = self.sessions[session_id]
         
         # Update financial data
-        session["financial_data"].update(extracted_data)
+        session.financial_data.update(extracted_data)
         
         # Add to conversation history
-        session["conversation_history"].append({
+        session.conversation_history.append({
             "timestamp": datetime.now().isoformat(),
             "query": query,
             "extracted_data": extracted_data
         })
         
-        session["last_updated"] = datetime.now()
+        session.last_updated = datetime.now()
         
         # Check if form is completed
-        session["form_completed"] = self._check_form_completion(session["financial_data"])
-        session["missing_fields"] = self._get_missing_fields(session["financial_data"])
+        completed = self._check_form_completion(session.financial_data)
+        session.form_completed = completed
+        session.missing_fields = [] if completed else self._get_missing_fields(session.financial_data)
         
         return True
     
-    def get_session_data(self, session_id: str) -> Optional[Dict[str, Any]]:
+    def get_session_data(self, session_id: str) -> Optional[SessionState]:
         """Get session data"""
         if session_id not in self.sessions:
             return None
@@ -67,7 +83,7 @@ class FinanceSessionManager:
         session = self.sessions[session_id]
         
         # Check if session expired
-        if datetime.now() - session["last_updated"] > self.session_timeout:
+        if datetime.now() - session.last_updated > self.session_timeout:
             del self.sessions[session_id]
             return None
         
@@ -75,14 +91,7 @@ class FinanceSessionManager:
     
     def _check_form_completion(self, financial_data: Dict[str, Any]) -> bool:
         """Check if we have enough data for comprehensive analysis"""
-        required_fields = [
-            "land_size_acres",
-            "annual_production",
-            "fertilizer_cost",
-            "water_cost"
-        ]
-        
-        return all(field in financial_data for field in required_fields)
+        return all(field in financial_data for field in _CRITICAL_FIELDS_ORDERED)
     
     def _get_missing_fields(self, financial_data: Dict[str, Any]) -> List[str]:
         """Get list of missing critical fields"""
@@ -112,8 +121,8 @@ class FinanceSessionManager:
         if not session:
             return self._error_response("Session not found")
         
-        current_data = session["financial_data"]
-        missing_fields = session["missing_fields"]
+        current_data = session.financial_data
+        missing_fields = session.missing_fields
         
         # Create form HTML/JSON structure
         form_data = {
@@ -225,8 +234,8 @@ class FinanceSessionManager:
                 }
             ],
             "completion_percentage": self._calculate_completion_percentage(current_data),
-            "missing_critical_fields": len([f for f in missing_fields if f["field"] in ["land_size_acres", "annual_production", "fertilizer_cost", "water_cost"]]),
-            "next_action": "submit_form" if session["form_completed"] else "continue_filling"
+            "missing_critical_fields": sum(1 for f in missing_fields if f["field"] in _CRITICAL_FIELDS),
+            "next_action": "submit_form" if session.form_completed else "continue_filling"
         }
         
         return {
@@ -275,8 +284,7 @@ class FinanceSessionManager:
         
         if missing_critical > 0:
             missing_section = f"### 📝 Critical Information Needed ({missing_critical} remaining):\n\n"
-            critical_fields = ["land_size_acres", "annual_production", "fertilizer_cost", "water_cost"]
-            for field in critical_fields:
+            for field in _CRITICAL_FIELDS_ORDERED:
                 if field not in form_data["current_data"] or not form_data["current_data"][field]:
                     label = self._get_field_label(field)
                     help_text = self._get_field_help(field)
@@ -0,0 +1,75 @@
+"""
+Keyword intent matching for the supervisor's fallback routing.
+Kept free of agent imports so it can be loaded and tested on its own.
+"""
+
+import re
+from typing import Dict, List, Tuple
+
+try:
+    import ahocorasick  # pyahocorasick
+except ImportError:
+    ahocorasick = None
+
+
+# Keyword routing the supervisor uses when the LLM cannot analyze a query
+INTENT_KEYWORDS = {
+    "weather": (
+        "weather", "rain", "rainfall", "monsoon", "forecast", "temperature", "heat", "cold",
+        "frost", "drought", "humidity", "wind", "storm", "climate", "irrigate", "irrigation",
+    ),
+    "crop": (
+        "fertilizer", "fertiliser", "npk", "urea", "pest", "insect", "disease", "fungus", "spray",
+        "seed", "variety", "sow", "sowing", "plant", "planting", "transplant", "spacing", "harvest",
+        "yield", "soil", "cultivation", "weed",
+    ),
+    "finance": (
+        "price", "msp", "mandi", "market", "sell", "selling", "rate", "cost", "profit", "income",
+        "revenue", "expense", "spend", "budget", "investment", "roi", "commodity", "trading",
+    ),
+    "policy": (
+        "scheme", "subsidy", "subsidies", "pm-kisan", "pm kisan", "government", "policy", "yojana",
+        "insurance", "pmfby", "fasal bima", "kcc", "kisan credit card", "loan", "credit", "eligible",
+        "eligibility", "apply", "application", "pension", "grant",
+    ),
+}
+
+
+def build_intent_matcher(use_automaton: bool = True):
+    """Compile INTENT_KEYWORDS into one matcher returning an (intent tag, keyword) pair per hit.
+    Keywords must start at a word boundary ("heat" does not match "wheat") but may be
+    followed by a suffix ("rain" matches "rainy"). Only the longest keyword starting at
+    a position counts, so "rainfall" is one hit rather than "rain" plus "rainfall"."""
+    keyword_tags: Dict[str, List[str]] = {}
+    for tag, keywords in INTENT_KEYWORDS.items():
+        for keyword in keywords:
+            keyword_tags.setdefault(keyword, []).append(tag)
+    
+    if use_automaton and ahocorasick is not None:
+        # Aho-Corasick finds every keyword in a single pass over the text
+        automaton = ahocorasick.Automaton()
+        for keyword, tags in keyword_tags.items():
+            automaton.add_word(keyword, (len(keyword), tuple((tag, keyword) for tag in tags)))
+        automaton.make_automaton()
+        
+        def match(text: str) -> List[Tuple[str, str]]:
+            longest: Dict[int, tuple] = {}
+            for end, (length, tags) in automaton.iter(text):
+                start = end - length + 1
+                if start > 0 and (text[start - 1].isalnum() or text[start - 1] == "_"):
+                    continue
+                if length > longest.get(start, (0,))[0]:
+                    longest[start] = (length, tags)
+            return [tag for start in sorted(longest) for tag in longest[start][1]]
+        return match
+    
+    # One compiled alternation tried longest-first, so the lookahead reports the
+    # longest keyword at each position, the same as the automaton path
+    pattern = re.compile(
+        r"(?=\b(" + "|".join(re.escape(k) for k in sorted(keyword_tags, key=len, reverse=True)) + "))"
+    )
+    return lambda text: [(tag, keyword) for keyword in pattern.findall(text) for tag in keyword_tags[keyword]]
+
+
+# Built once at import and shared by every caller
+match_intents = build_intent_matcher()
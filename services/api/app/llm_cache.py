@@ -0,0 +1,165 @@
+"""
+Response cache for LLM generations.
+In-process LRU with optional Redis persistence and a semantic fallback
+for near-duplicate queries.
+"""
+
+import hashlib
+import json
+import os
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Protocol, Tuple
+
+import numpy as np
+
+
+class CacheBackend(Protocol):
+    """Minimal key/value interface shared by the cache backends"""
+
+    def get(self, key: str) -> Optional[str]:
+        ...
+
+    def set(self, key: str, value: str, ttl: int) -> bool:
+        ...
+
+
+class MemoryBackend:
+    """Size-capped in-process LRU with per-entry expiry"""
+
+    def __init__(self, maxsize: int = 512):
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+
+    def get(self, key: str) -> Optional[str]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at < time.time():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    def set(self, key: str, value: str, ttl: int) -> bool:
+        self._entries[key] = (time.time() + ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+        return True
+
+
+class RedisBackend:
+    """Adapter over the shared Redis CacheService"""
+
+    def __init__(self, cache_service):
+        self.cache_service = cache_service
+
+    def get(self, key: str) -> Optional[str]:
+        value = self.cache_service.get(key)
+        return value if isinstance(value, str) else None
+
+    def set(self, key: str, value: str, ttl: int) -> bool:
+        return self.cache_service.set(key, value, ttl=ttl)
+
+
+class LLMCache:
+    """Exact-match response cache with an embedding-similarity fallback"""
+
+    def __init__(
+        self,
+        backends: Optional[List[CacheBackend]] = None,
+        embedder: Optional[Callable[[str], Any]] = None,
+        similarity_threshold: float = 0.92,
+        semantic_window: int = 256,
+        semantic_scopes: int = 1024,
+        default_ttl: int = 3600
+    ):
+        self.backends = backends if backends is not None else [MemoryBackend()]
+        self.default_ttl = default_ttl
+        self.embedder = embedder
+        self.similarity_threshold = similarity_threshold
+        self.semantic_window = semantic_window
+        self.semantic_scopes = semantic_scopes
+        # Recent (key, normalized query embedding) pairs, grouped by scope so a
+        # near-duplicate query only matches answers built from the same evidence;
+        # the least recently used scope is dropped once there are too many
+        self._semantic_index: "OrderedDict[str, List[Tuple[str, np.ndarray]]]" = OrderedDict()
+
+    @staticmethod
+    def make_key(**parts) -> str:
+        """Build a stable key from the generation inputs"""
+        payload = json.dumps(parts, sort_keys=True, ensure_ascii=False)
+        return "llm:" + hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key: str, query: Optional[str] = None, scope: Optional[str] = None) -> Optional[str]:
+        """Return a cached response for key, or for a semantically similar query"""
+        for i, backend in enumerate(self.backends):
+            value = backend.get(key)
+            if value is not None:
+                # Promote hits from slower backends into the faster ones
+                for faster in self.backends[:i]:
+                    faster.set(key, value, self.default_ttl)
+                return value
+
+        if query is None or scope is None or self.embedder is None:
+            return None
+        candidates = self._semantic_index.get(scope)
+        if not candidates:
+            return None
+        self._semantic_index.move_to_end(scope)
+        query_vec = self._embed(query)
+        if query_vec is None:
+            return None
+        matrix = np.stack([vec for _, vec in candidates])
+        sims = matrix @ query_vec
+        best = int(np.argmax(sims))
+        if sims[best] < self.similarity_threshold:
+            return None
+        return self.backends[0].get(candidates[best][0])
+
+    def set(self, key: str, value: str, ttl: Optional[int] = None, query: Optional[str] = None, scope: Optional[str] = None):
+        """Store a response in every backend and index its query embedding"""
+        ttl = ttl or self.default_ttl
+        for backend in self.backends:
+            backend.set(key, value, ttl)
+
+        if query is None or scope is None or self.embedder is None:
+            return
+        query_vec = self._embed(query)
+        if query_vec is None:
+            return
+        candidates = self._semantic_index.setdefault(scope, [])
+        self._semantic_index.move_to_end(scope)
+        candidates.append((key, query_vec))
+        if len(candidates) > self.semantic_window:
+            del candidates[0]
+        while len(self._semantic_index) > self.semantic_scopes:
+            self._semantic_index.popitem(last=False)
+
+    def _embed(self, text: str) -> Optional[np.ndarray]:
+        try:
+            vec = np.asarray(self.embedder(text), dtype=np.float32)
+        except Exception:
+            return None
+        return vec / (np.linalg.norm(vec) + 1e-12)
+
+
+def build_llm_cache() -> LLMCache:
+    """Create the cache with Redis persistence when it is reachable"""
+    backends: List[CacheBackend] = [MemoryBackend(int(os.getenv("LLM_CACHE_SIZE", "512")))]
+    try:
+        try:
+            from .cache import get_cache_service
+        except ImportError:
+            from cache import get_cache_service
+        cache_service = get_cache_service()
+        if cache_service.enabled:
+            backends.append(RedisBackend(cache_service))
+    except Exception:
+        pass
+    return LLMCache(
+        backends=backends,
+        similarity_threshold=float(os.getenv("LLM_CACHE_SIMILARITY", "0.92"))
+    )
@@ -4,53 +4,424 @@ Supports both Google Gemini and local models.
 """
 
 import os
-from typing import List, Dict, Any
+import asyncio
+import functools
+from typing import List, Dict, Any, Iterator, AsyncIterator
 import json
+import re
+import time
+import threading
+from collections import OrderedDict
 
 try:
-    import google.generativeai as genai
+    from .llm_cache import build_llm_cache
 except ImportError:
-    genai = None
+    from llm_cache import build_llm_cache
 
-try:
-    from transformers import pipeline
-except ImportError:
-    pipeline = None
+# google.generativeai and transformers are imported lazily in LLMClient._setup_client:
+# both are slow to import and only one of them is used by a given worker.
+
+
+def _is_rate_limited(error: Exception) -> bool:
+    try:
+        from google.api_core.exceptions import ResourceExhausted
+    except ImportError:
+        return False
+    return isinstance(error, ResourceExhausted)
+
+
+GEMINI_MODEL_NAME = 'gemini-2.5-flash-lite'
+GEMINI_API_ENDPOINT = "generativelanguage.googleapis.com"
+
+# Prompt templates are built once and filled with str.format_map per call
+_ANSWER_PROMPT_TMPL = (
+    "You are an agricultural advisor. Answer the following question based ONLY on the provided evidence. "
+    "If the evidence doesn't contain enough information, say so. Keep your answer concise and practical.\n\n"
+    "Question: {q}\n\nEvidence:\n{e}\n\nAnswer:"
+)
+_TRANSLATED_ANSWER_SUFFIX_TMPL = (
+    "\n\nRespond with a JSON object with keys 'en' and '{lang}'. Put the English answer under 'en', "
+    "then its translation to {lang} (Indian locale if applicable) under '{lang}'. "
+    "Preserve meaning and formatting, keep units and numbers."
+)
+_TRANSLATION_PROMPT_TMPL = (
+    "Translate the following response from English to {lang} (Indian locale if applicable).\n"
+    "Preserve meaning and formatting, keep units and numbers.\n\n{text}"
+)
+_LOCAL_PROMPT_TMPL = "Question: {q}\nEvidence: {e}\nAnswer:"
+_EVIDENCE_LINE_TMPL = "{}. {} (Source: {})"
+
+# Queries that never need an LLM round-trip
+# Only bare greetings match; "hi, what fertilizer for wheat?" still goes to the LLM
+_GREETING_RE = re.compile(r"\s*(hi|hello|hey|namaste|thanks|thank you)( there)?[\s!.,]*", re.IGNORECASE)
+GREETING_RESPONSE = (
+    "Namaste! I'm your agricultural advisor. Ask me about crops, weather, "
+    "market prices, or government schemes for your farm."
+)
+
+# Evidence beyond this many tokens is truncated before it reaches the prompt
+MAX_EVIDENCE_TOKENS = int(os.getenv("MAX_EVIDENCE_TOKENS", "1500"))
+MIN_EVIDENCE_TOKENS = 50
+CHARS_PER_TOKEN = 4
+_TOKEN_COUNT_CACHE_SIZE = 4096
+
+# ISO 639-1 codes from Accept-Language mapped to NLLB/FLORES-200 language codes
+NLLB_LANGUAGE_CODES = {
+    "hi": "hin_Deva",
+    "bn": "ben_Beng",
+    "gu": "guj_Gujr",
+    "kn": "kan_Knda",
+    "ml": "mal_Mlym",
+    "mr": "mar_Deva",
+    "or": "ory_Orya",
+    "pa": "pan_Guru",
+    "ta": "tam_Taml",
+    "te": "tel_Telu",
+    "ur": "urd_Arab",
+}
+
+
+def load_quantized_model(model_cls, model_name: str):
+    """Load a transformers model with the smallest weights the hardware supports.
+
+    CUDA: 8-bit via bitsandbytes, else bf16/fp16. CPU: dynamic int8 quantization
+    of the Linear layers. Returns (model, device).
+    """
+    import torch
+    
+    if torch.cuda.is_available():
+        try:
+            from transformers import BitsAndBytesConfig
+            import bitsandbytes  # noqa: F401
+            model = model_cls.from_pretrained(
+                model_name,
+                quantization_config=BitsAndBytesConfig(load_in_8bit=True),
+                device_map="auto"
+            )
+            return model, model.device
+        except ImportError:
+            dtype = torch.bfloat16 if torch.cuda.is_bf16_supported() else torch.float16
+            return model_cls.from_pretrained(model_name, torch_dtype=dtype).to("cuda"), "cuda"
+    
+    model = model_cls.from_pretrained(model_name, torch_dtype=torch.float32)
+    if os.getenv("LOCAL_MODEL_INT8", "1") == "1":
+        model = torch.ao.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+    return model, "cpu"
+
+
+class LocalTranslator:
+    """Seq2seq English-to-Indic translation with an NLLB-style model"""
+    
+    def __init__(self, model_name: str):
+        from transformers import AutoTokenizer, AutoModelForSeq2SeqLM
+        
+        self.tokenizer = AutoTokenizer.from_pretrained(model_name, src_lang="eng_Latn")
+        self.model, self.device = load_quantized_model(AutoModelForSeq2SeqLM, model_name)
+        self.model.eval()
+    
+    def supports(self, language: str) -> bool:
+        return language in NLLB_LANGUAGE_CODES
+    
+    def translate(self, text: str, language: str) -> str:
+        import torch
+        
+        target = NLLB_LANGUAGE_CODES[language]
+        inputs = self.tokenizer(text, return_tensors="pt", truncation=True, max_length=512).to(self.device)
+        with torch.inference_mode():
+            output = self.model.generate(
+                **inputs,
+                forced_bos_token_id=self.tokenizer.convert_tokens_to_ids(target),
+                max_new_tokens=512,
+                num_beams=1
+            )
+        return self.tokenizer.batch_decode(output, skip_special_tokens=True)[0].strip()
+
+
+_local_translator = None
+_local_translator_lock = threading.Lock()
+_local_translator_failed = False
+
+
+def get_local_translator() -> LocalTranslator | None:
+    """Load the model named by LOCAL_TRANSLATION_MODEL once per process"""
+    global _local_translator, _local_translator_failed
+    model_name = os.getenv("LOCAL_TRANSLATION_MODEL")
+    if not model_name or _local_translator_failed:
+        return None
+    if _local_translator is None:
+        with _local_translator_lock:
+            if _local_translator is None and not _local_translator_failed:
+                try:
+                    _local_translator = LocalTranslator(model_name)
+                    print(f"Local translation model loaded: {model_name}")
+                except Exception as e:
+                    print(f"Failed to load local translation model, using Gemini: {e}")
+                    _local_translator_failed = True
+    return _local_translator
+
+# Streamed chunks longer than this are re-split so the client renders smoothly
+STREAM_MEGA_CHUNK_CHARS = 50
+STREAM_PIECE_DELAY = 0.005
+# One word plus its trailing whitespace; leading whitespace stays attached so
+# the pieces always concatenate back to the original chunk
+_TOKEN_RE = re.compile(r"\s*\S+\s*|\s+")
+
+
+async def _rechunk(text: str) -> AsyncIterator[str]:
+    """Split an oversized streamed chunk into evenly paced word pieces"""
+    if len(text) <= STREAM_MEGA_CHUNK_CHARS:
+        yield text
+        return
+    for match in _TOKEN_RE.finditer(text):
+        yield match.group(0)
+        await asyncio.sleep(STREAM_PIECE_DELAY)
+
+
+class TokenBucket:
+    """Token bucket that refills continuously at capacity per period.
+    Thread-safe: callers reserve tokens up front and then wait out any deficit."""
+    
+    def __init__(self, capacity: int, period: float = 60.0):
+        self.capacity = capacity
+        self.rate = capacity / period
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def reserve(self, amount: int = 1) -> float:
+        """Take amount tokens, going into debt if needed; returns seconds to wait"""
+        amount = min(amount, self.capacity)
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= amount
+            return max(0.0, -self._tokens / self.rate)
+
+
+class GeminiRateLimiter:
+    """Request and input-token quotas shared by every Gemini generation call, sync or async"""
+    
+    def __init__(self, requests_per_minute: int = 60, tokens_per_minute: int = 1000000):
+        self.request_bucket = TokenBucket(requests_per_minute)
+        self.token_bucket = TokenBucket(tokens_per_minute)
+    
+    def _reserve(self, prompt: str) -> float:
+        return max(
+            self.request_bucket.reserve(),
+            self.token_bucket.reserve(len(prompt) // CHARS_PER_TOKEN + 1)
+        )
+    
+    def throttle_sync(self, prompt: str = ""):
+        """Block the calling thread until the call fits the quota"""
+        delay = self._reserve(prompt)
+        if delay:
+            time.sleep(delay)
+    
+    async def throttle(self, prompt: str = ""):
+        """Wait, without blocking the event loop, until the call fits the quota"""
+        delay = self._reserve(prompt)
+        if delay:
+            await asyncio.sleep(delay)
+
+
+class GeminiDispatcher:
+    """Issues queued Gemini prompts concurrently.
+
+    Each prompt is dispatched as soon as it is dequeued, bounded by a semaphore
+    for the API quota, and retried with backoff when rate limited. The Gemini
+    API has no batch endpoint, so prompts are never held back to group them.
+    """
+    
+    def __init__(self, model, rate_limiter: GeminiRateLimiter, concurrency: int = 8, max_retries: int = 5):
+        self.model = model
+        self.concurrency = concurrency
+        self.max_retries = max_retries
+        # Stay under the Gemini quota instead of paying for 429 retries
+        self.rate_limiter = rate_limiter
+        self._loop = None
+        self._queue = None
+        self._semaphore = None
+        self._worker = None
+        # Strong references to in-flight dispatches; the loop only keeps weak ones
+        self._tasks = set()
+    
+    async def submit(self, prompt: str, generation_config) -> str:
+        """Queue a prompt and wait for its generated text"""
+        self._ensure_worker()
+        future = self._loop.create_future()
+        await self._queue.put((prompt, generation_config, future))
+        return await future
+    
+    def _ensure_worker(self):
+        # Queues and semaphores are bound to the loop that created them
+        loop = asyncio.get_running_loop()
+        if self._worker is None or self._worker.done() or self._loop is not loop:
+            self._loop = loop
+            self._queue = asyncio.Queue()
+            self._semaphore = asyncio.Semaphore(self.concurrency)
+            self._worker = loop.create_task(self._drain())
+    
+    async def _drain(self):
+        while True:
+            item = await self._queue.get()
+            # Don't hold the queue while this prompt is in flight
+            task = self._loop.create_task(self._dispatch(*item))
+            self._tasks.add(task)
+            task.add_done_callback(self._dispatch_done)
+    
+    def _dispatch_done(self, task: asyncio.Task):
+        self._tasks.discard(task)
+        # Failures reach the caller through its future; retrieve any stray exception
+        if not task.cancelled() and task.exception() is not None:
+            print(f"Gemini dispatch error: {task.exception()}")
+    
+    async def _dispatch(self, prompt: str, generation_config, future: asyncio.Future):
+        delay = 1.0
+        for attempt in range(self.max_retries + 1):
+            try:
+                # Wait for quota before taking a slot so queued prompts don't hold one
+                await self.rate_limiter.throttle(prompt)
+                async with self._semaphore:
+                    response = await self.model.generate_content_async(prompt, generation_config=generation_config)
+                if not future.done():
+                    future.set_result(response.text.strip())
+                return
+            except Exception as e:
+                rate_limited = _is_rate_limited(e)
+                if rate_limited and attempt < self.max_retries:
+                    await asyncio.sleep(delay)
+                    delay = min(delay * 2, 30.0)
+                    continue
+                if not future.done():
+                    future.set_exception(e)
+                return
 
 
 class LLMClient:
     def __init__(self):
         self.gemini_model = None
         self.local_pipeline = None
+        self._genai = None
+        self.dispatcher = None
+        self.rate_limiter = None
+        self.cache = build_llm_cache()
+        # Cumulative token counts reported by streamed Gemini responses
+        self.token_usage = {"prompt_tokens": 0, "output_tokens": 0}
+        # Cache key -> task of the Gemini call currently producing that answer
+        self._inflight: Dict[str, asyncio.Task] = {}
+        # Generation settings are read once; GenerationConfig objects are built in _setup_client
+        self.max_output_tokens = int(os.getenv("GEMINI_MAX_OUTPUT_TOKENS", "1200"))
+        # Evidence answers are short; only detailed analysis needs the full budget
+        self.max_tokens_answer = int(os.getenv("GEMINI_MAX_TOKENS_ANSWER", "256"))
+        self.max_tokens_analysis = int(os.getenv("GEMINI_MAX_TOKENS_ANALYSIS", "1200"))
+        self.max_tokens_translate = int(os.getenv("GEMINI_MAX_TOKENS_TRANSLATE", "1024"))
+        self.local_max_length = int(os.getenv("LOCAL_MAX_LENGTH", "800"))
+        self._gen_cfg_translated: Dict[str, Any] = {}
+        # Excerpt text -> Gemini token count, filled in the background off the request path
+        self._token_counts: "OrderedDict[str, int]" = OrderedDict()
+        self._token_count_tasks: Dict[str, asyncio.Task] = {}
         self._setup_client()
     
     def _setup_client(self):
         """Setup either Google Gemini or local model"""
         # Try Gemini first
-        if genai and os.getenv("GEMINI_API_KEY"):
+        genai = None
+        if os.getenv("GEMINI_API_KEY"):
+            try:
+                import google.generativeai as genai
+            except ImportError:
+                print("google-generativeai not installed, skipping Gemini")
+        if genai:
             try:
                 api_key = os.getenv("GEMINI_API_KEY")
                 if api_key:
-                    genai.configure(api_key=api_key)
-                    self.gemini_model = genai.GenerativeModel('gemini-2.5-flash-lite')
+                    self._genai = genai
+                    # The SDK keeps one long-lived gRPC channel per client; transport is left
+                    # unset so the async client gets grpc_asyncio rather than the sync transport
+                    genai.configure(
+                        api_key=api_key,
+                        client_options={"api_endpoint": GEMINI_API_ENDPOINT}
+                    )
+                    self.gemini_model = genai.GenerativeModel(GEMINI_MODEL_NAME)
+                    self._setup_generation_configs()
+                    self.rate_limiter = GeminiRateLimiter(
+                        requests_per_minute=int(os.getenv("GEMINI_RPM", "60")),
+                        tokens_per_minute=int(os.getenv("GEMINI_TPM", "1000000"))
+                    )
+                    self.dispatcher = GeminiDispatcher(
+                        self.gemini_model,
+                        self.rate_limiter,
+                        concurrency=int(os.getenv("GEMINI_CONCURRENCY", "8"))
+                    )
                     print("Gemini client initialized successfully")
                     return
             except Exception as e:
                 print(f"Failed to initialize Gemini client: {e}")
                 self.gemini_model = None
         
-        # Skip local model to avoid TensorFlow issues
+        # Local generation is opt-in; loading it by default caused TensorFlow issues
+        if os.getenv("USE_LOCAL_LLM"):
+            try:
+                from transformers import AutoModelForCausalLM, AutoTokenizer, pipeline
+                model_name = os.getenv("LOCAL_MODEL", "microsoft/DialoGPT-small")
+                model, _ = load_quantized_model(AutoModelForCausalLM, model_name)
+                self.local_pipeline = pipeline(
+                    "text-generation",
+                    model=model,
+                    tokenizer=AutoTokenizer.from_pretrained(model_name)
+                )
+                print(f"Local model initialized: {model_name}")
+                return
+            except Exception as e:
+                print(f"Failed to initialize local model: {e}")
+        
         print("Using fallback text generation (no LLM)")
         self.local_pipeline = None
     
-    def generate_answer(self, query: str, evidence: List[Dict[str, Any]], language: str | None = None) -> str:
-        """Generate an answer from query and evidence"""
-        if not evidence:
-            return "I don't have enough information to answer this question."
+    def _setup_generation_configs(self):
+        """Build the per-path GenerationConfig objects once instead of per call"""
+        self._gen_cfg_answer = self._genai.types.GenerationConfig(
+            max_output_tokens=self.max_tokens_answer,
+            temperature=0.3,
+            # Stop if the model starts inventing another question/evidence block
+            stop_sequences=["\n\nQuestion:", "\n\nEvidence:"],
+        )
+        self._gen_cfg_text = self._genai.types.GenerationConfig(
+            max_output_tokens=self.max_output_tokens,
+            temperature=0.3,
+        )
+        self._gen_cfg_analysis = self._genai.types.GenerationConfig(
+            max_output_tokens=self.max_tokens_analysis,  # Longer response for detailed analysis
+            temperature=0.3,
+        )
+        self._gen_cfg_translate = self._genai.types.GenerationConfig(
+            max_output_tokens=self.max_tokens_translate,
+            temperature=0.2,
+        )
+    
+    def generate_answer(self, query: str, evidence: List[Dict[str, Any]], language: str | None = None, stream: bool = False):
+        """Generate an answer from query and evidence.
+
+        With stream=True, returns an iterator of text chunks instead of the full
+        answer; only an uncached English Gemini answer arrives in more than one chunk.
+        """
+        if stream:
+            return self._generate_answer_stream(query, evidence, language)
+        
+        direct = self._try_direct(query, evidence)
+        if direct is not None:
+            return self._translate_text(direct, language) if language and language != 'en' else direct
         
         # Format evidence for prompt
         evidence_text = self._format_evidence(evidence)
         
+        # Answer and translate in one round-trip when the model cooperates
+        if self.gemini_model and language and language != 'en' and not self._can_translate_locally(language):
+            translated = self._generate_gemini_translated(query, evidence_text, language)
+            if translated is not None:
+                return translated
+        
         if self.gemini_model:
             answer = self._generate_gemini(query, evidence_text)
         elif self.local_pipeline:
@@ -66,16 +437,86 @@ class LLMClient:
                 pass
         return answer
     
+    async def astream_answer(self, query: str, evidence: List[Dict[str, Any]]) -> AsyncIterator[str]:
+        """Stream an answer from query and evidence as it is generated"""
+        direct = self._try_direct(query, evidence)
+        if direct is not None:
+            yield direct
+            return
+        
+        evidence_text = await self._aformat_evidence(evidence)
+        if not self.gemini_model:
+            if self.local_pipeline:
+                yield self._generate_local(query, evidence_text)
+            else:
+                yield self._generate_fallback(query, evidence_text)
+            return
+        
+        key, scope = self._answer_cache_keys(query, evidence_text)
+        cached = self.cache.get(key, query=query, scope=scope)
+        if cached is not None:
+            async for piece in _rechunk(cached):
+                yield piece
+            return
+        
+        pieces = []
+        try:
+            prompt = self._answer_prompt(query, evidence_text)
+            await self.rate_limiter.throttle(prompt)
+            response = await self.gemini_model.generate_content_async(
+                prompt,
+                generation_config=self._gen_cfg_answer,
+                stream=True
+            )
+            chunk = None
+            async for chunk in response:
+                text = chunk.text
+                pieces.append(text)
+                async for piece in _rechunk(text):
+                    yield piece
+            self._record_usage(chunk)
+        except Exception as e:
+            print(f"Gemini streaming error: {e}")
+            if not pieces:
+                yield self._generate_fallback(query, evidence_text)
+            return
+        self.cache.set(key, "".join(pieces).strip(), ttl=3600, query=query, scope=scope)
+    
+    async def agenerate_answer(self, query: str, evidence: List[Dict[str, Any]], language: str | None = None) -> str:
+        """Async variant of generate_answer that routes Gemini calls through the dispatcher"""
+        direct = self._try_direct(query, evidence)
+        if direct is not None:
+            return await self._atranslate_text(direct, language) if language and language != 'en' else direct
+        
+        evidence_text = await self._aformat_evidence(evidence)
+        
+        if self.gemini_model and language and language != 'en' and not self._can_translate_locally(language):
+            translated = await self._agenerate_gemini_translated(query, evidence_text, language)
+            if translated is not None:
+                return translated
+        
+        if self.gemini_model:
+            answer = await self._agenerate_gemini(query, evidence_text)
+        elif self.local_pipeline:
+            answer = self._generate_local(query, evidence_text)
+        else:
+            answer = self._generate_fallback(query, evidence_text)
+        
+        if language and language != 'en':
+            try:
+                answer = await self._atranslate_text(answer, language)
+            except Exception:
+                pass
+        return answer
+    
     def generate_text(self, prompt: str, language: str | None = None) -> str:
         """Generate text from a prompt without requiring evidence"""
         if self.gemini_model:
             try:
+                self.rate_limiter.throttle_sync(prompt)
                 response = self.gemini_model.generate_content(
                     prompt,
-                    generation_config=genai.types.GenerationConfig(
-                        max_output_tokens=int(os.getenv("GEMINI_MAX_OUTPUT_TOKENS", "1200")),
-                        temperature=0.3,
-                    )
+                    generation_config=self._gen_cfg_text
                 )
                 text = response.text.strip()
                 if language and language != 'en':
@@ -91,7 +532,7 @@ class LLMClient:
             try:
                 response = self.local_pipeline(
                     prompt,
-                    max_length=int(os.getenv("LOCAL_MAX_LENGTH", "800")),
+                    max_length=self.local_max_length,
                     do_sample=True,
                     temperature=0.7,
                 )
@@ -110,16 +551,39 @@ class LLMClient:
                     pass
             return text
 
+    async def astream_text(self, prompt: str) -> AsyncIterator[str]:
+        """Stream generate_text output as it is generated"""
+        if not self.gemini_model:
+            yield await asyncio.to_thread(self.generate_text, prompt)
+            return
+        
+        emitted = False
+        try:
+            await self.rate_limiter.throttle(prompt)
+            response = await self.gemini_model.generate_content_async(
+                prompt,
+                generation_config=self._gen_cfg_text,
+                stream=True
+            )
+            chunk = None
+            async for chunk in response:
+                async for piece in _rechunk(chunk.text):
+                    emitted = True
+                    yield piece
+            self._record_usage(chunk)
+        except Exception as e:
+            print(f"Gemini streaming error: {e}")
+            if not emitted:
+                yield "Unable to generate response at this time."
+
     def generate_agricultural_analysis(self, custom_prompt: str) -> str:
         """Generate agricultural analysis using a custom detailed prompt"""
         if self.gemini_model:
             try:
+                self.rate_limiter.throttle_sync(custom_prompt)
                 response = self.gemini_model.generate_content(
                     custom_prompt,
-                    generation_config=genai.types.GenerationConfig(
-                        max_output_tokens=int(os.getenv("GEMINI_MAX_OUTPUT_TOKENS", "1200")),  # Longer response for detailed analysis
-                        temperature=0.3,
-                    )
+                    generation_config=self._gen_cfg_analysis
                 )
                 return response.text.strip()
             except Exception as e:
@@ -129,7 +593,7 @@ class LLMClient:
             try:
                 response = self.local_pipeline(
                     custom_prompt,
-                    max_length=int(os.getenv("LOCAL_MAX_LENGTH", "800")),
+                    max_length=self.local_max_length,
                     do_sample=True,
                     temperature=0.7,
                 )
@@ -142,47 +606,271 @@ class LLMClient:
         else:
             return "Detailed agricultural analysis requires an AI model. Please consult local weather services and agricultural experts."
     
+    def _try_direct(self, query: str, evidence: List[Dict[str, Any]]) -> str | None:
+        """Answer without the LLM when the query is a bare greeting or there is no evidence"""
+        if _GREETING_RE.fullmatch(query):
+            return GREETING_RESPONSE
+        if not evidence:
+            return "I don't have enough information to answer this question."
+        return None
+    
     def _format_evidence(self, evidence: List[Dict[str, Any]]) -> str:
-        """Format evidence into a readable string"""
-        formatted = []
-        for i, e in enumerate(evidence[:3], 1):  # Top 3 pieces of evidence
-            excerpt = e.get("excerpt", "")
-            source = e.get("source", "unknown")
-            formatted.append(f"{i}. {excerpt} (Source: {source})")
-        return "\n".join(formatted)
+        """Format evidence into a readable string within the evidence token budget"""
+        top = evidence[:3]  # Top 3 pieces of evidence
+        counts = [self._count_tokens(e.get("excerpt", "") or "") for e in top]
+        return self._pack_evidence(top, counts)
+    
+    async def _aformat_evidence(self, evidence: List[Dict[str, Any]]) -> str:
+        """Async variant of _format_evidence that also fetches exact counts for new excerpts.
+        The counts land in the background and only affect later prompts."""
+        top = evidence[:3]
+        if self.gemini_model:
+            for e in top:
+                self._schedule_token_count(e.get("excerpt", "") or "")
+        return self._format_evidence(top)
+    
+    def _pack_evidence(self, evidence: List[Dict[str, Any]], counts: List[int]) -> str:
+        """Greedily fit excerpts into MAX_EVIDENCE_TOKENS given their token counts"""
+        lines = []
+        remaining = MAX_EVIDENCE_TOKENS
+        for i, (e, tokens) in enumerate(zip(evidence, counts), 1):
+            if remaining < MIN_EVIDENCE_TOKENS:
+                break
+            excerpt = e.get("excerpt", "") or ""
+            if tokens > remaining:
+                excerpt = excerpt[:remaining * CHARS_PER_TOKEN].rstrip() + "..."
+                tokens = remaining
+            remaining -= tokens
+            lines.append(_EVIDENCE_LINE_TMPL.format(i, excerpt, e.get("source", "unknown")))
+        return "\n".join(lines)
+    
+    def _count_tokens(self, text: str) -> int:
+        """Gemini token count for text when already known, else a chars/4 estimate.
+        Never waits on the API, so uncached answers pay no extra round-trips."""
+        count = self._token_counts.get(text)
+        if count is None:
+            return len(text) // CHARS_PER_TOKEN
+        self._token_counts.move_to_end(text)
+        return count
+    
+    def _schedule_token_count(self, text: str):
+        if not text or text in self._token_counts or text in self._token_count_tasks:
+            return
+        task = asyncio.get_running_loop().create_task(self._fetch_token_count(text))
+        self._token_count_tasks[text] = task
+        task.add_done_callback(lambda _: self._token_count_tasks.pop(text, None))
+    
+    async def _fetch_token_count(self, text: str):
+        # count_tokens has its own quota, so this best-effort prefetch never draws on the
+        # generation limiter; a rejected count just leaves the estimate in place
+        try:
+            count = (await self.gemini_model.count_tokens_async(text)).total_tokens
+        except Exception:
+            return
+        self._remember_token_count(text, count)
+    
+    def _remember_token_count(self, text: str, count: int):
+        self._token_counts[text] = count
+        self._token_counts.move_to_end(text)
+        while len(self._token_counts) > _TOKEN_COUNT_CACHE_SIZE:
+            self._token_counts.popitem(last=False)
+    
+    def _answer_prompt(self, query: str, evidence: str) -> str:
+        return _ANSWER_PROMPT_TMPL.format_map({"q": query, "e": evidence})
+    
+    def _answer_cache_keys(self, query: str, evidence: str):
+        # Identical (query, evidence) pairs reuse the previous answer; near-duplicate
+        # queries over the same evidence can match through the semantic index
+        key = self.cache.make_key(model=GEMINI_MODEL_NAME, q=query, e=evidence, t=0.3)
+        scope = self.cache.make_key(model=GEMINI_MODEL_NAME, e=evidence, t=0.3)
+        return key, scope
     
     def _generate_gemini(self, query: str, evidence: str) -> str:
         """Generate answer using Google Gemini"""
-        prompt = f"""You are an agricultural advisor. Answer the following question based ONLY on the provided evidence. If the evidence doesn't contain enough information, say so. Keep your answer concise and practical.
-
-Question: {query}
-
-Evidence:
-{evidence}
-
-Answer:"""
+        key, scope = self._answer_cache_keys(query, evidence)
+        cached = self.cache.get(key, query=query, scope=scope)
+        if cached is not None:
+            return cached
+        
+        try:
+            prompt = self._answer_prompt(query, evidence)
+            self.rate_limiter.throttle_sync(prompt)
+            response = self.gemini_model.generate_content(prompt, generation_config=self._gen_cfg_answer)
+            answer = response.text.strip()
+            self.cache.set(key, answer, ttl=3600, query=query, scope=scope)
+            return answer
+        except Exception as e:
+            print(f"Gemini error: {e}")
+            return self._generate_fallback(query, evidence)
+    
+    def _translated_answer_prompt(self, query: str, evidence: str, language: str) -> str:
+        return self._answer_prompt(query, evidence) + _TRANSLATED_ANSWER_SUFFIX_TMPL.format_map({"lang": language})
+    
+    def _translated_generation_config(self, language: str):
+        config = self._gen_cfg_translated.get(language)
+        if config is None:
+            config = self._gen_cfg_translated[language] = self._build_translated_generation_config(language)
+        return config
+    
+    def _build_translated_generation_config(self, language: str):
+        params = dict(
+            # Room for the English answer plus its translation
+            max_output_tokens=self.max_tokens_answer + self.max_tokens_translate,
+            temperature=0.3,
+        )
+        try:
+            return self._genai.types.GenerationConfig(
+                response_mime_type="application/json",
+                response_schema={
+                    "type": "object",
+                    "properties": {"en": {"type": "string"}, language: {"type": "string"}},
+                    "required": ["en", language],
+                },
+                **params
+            )
+        except TypeError:
+            # Older SDKs have no structured output; the prompt still asks for JSON
+            return self._genai.types.GenerationConfig(**params)
+    
+    def _parse_translated_answer(self, text: str, language: str) -> str | None:
+        text = text.strip()
+        if text.startswith("```"):
+            text = text.strip("`")
+            text = text[text.find("{"):]
+        try:
+            value = json.loads(text).get(language)
+        except (ValueError, AttributeError):
+            return None
+        return value.strip() if isinstance(value, str) and value.strip() else None
+    
+    def _generate_gemini_translated(self, query: str, evidence: str, language: str) -> str | None:
+        """Generate the answer and its translation in a single Gemini call"""
+        key = self.cache.make_key(model=GEMINI_MODEL_NAME, q=query, e=evidence, t=0.3, lang=language)
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+        try:
+            prompt = self._translated_answer_prompt(query, evidence, language)
+            self.rate_limiter.throttle_sync(prompt)
+            response = self.gemini_model.generate_content(
+                prompt,
+                generation_config=self._translated_generation_config(language)
+            )
+            answer = self._parse_translated_answer(response.text, language)
+        except Exception as e:
+            print(f"Gemini translated answer error: {e}")
+            return None
+        if answer is not None:
+            self.cache.set(key, answer, ttl=3600)
+        return answer
+    
+    async def _agenerate_gemini_translated(self, query: str, evidence: str, language: str) -> str | None:
+        """Async variant of _generate_gemini_translated"""
+        key = self.cache.make_key(model=GEMINI_MODEL_NAME, q=query, e=evidence, t=0.3, lang=language)
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+        try:
+            text = await self._single_flight(key, lambda: self.dispatcher.submit(
+                self._translated_answer_prompt(query, evidence, language),
+                self._translated_generation_config(language)
+            ))
+            answer = self._parse_translated_answer(text, language)
+        except Exception as e:
+            print(f"Gemini translated answer error: {e}")
+            return None
+        if answer is not None:
+            self.cache.set(key, answer, ttl=3600)
+        return answer
+    
+    def _generate_answer_stream(self, query: str, evidence: List[Dict[str, Any]], language: str | None) -> Iterator[str]:
+        """generate_answer(stream=True); every path that has no stream yields its answer whole"""
+        if not self.gemini_model or (language and language != 'en') or self._try_direct(query, evidence) is not None:
+            yield self.generate_answer(query, evidence, language)
+            return
         
+        evidence_text = self._format_evidence(evidence)
+        key, scope = self._answer_cache_keys(query, evidence_text)
+        cached = self.cache.get(key, query=query, scope=scope)
+        if cached is not None:
+            yield cached
+            return
+        yield from self._generate_gemini_stream(query, evidence_text, key, scope)
+    
+    def _generate_gemini_stream(self, query: str, evidence: str, key: str, scope: str) -> Iterator[str]:
+        """Stream answer chunks from Google Gemini, caching the completed answer"""
+        pieces = []
         try:
+            prompt = self._answer_prompt(query, evidence)
+            self.rate_limiter.throttle_sync(prompt)
             response = self.gemini_model.generate_content(
                 prompt,
-                generation_config=genai.types.GenerationConfig(
-                    max_output_tokens=int(os.getenv("GEMINI_MAX_OUTPUT_TOKENS", "1200")),
-                    temperature=0.3,
-                )
+                generation_config=self._gen_cfg_answer,
+                stream=True
             )
-            return response.text.strip()
+            chunk = None
+            for chunk in response:
+                pieces.append(chunk.text)
+                yield chunk.text
+            self._record_usage(chunk)
+        except Exception as e:
+            print(f"Gemini streaming error: {e}")
+            if not pieces:
+                yield self._generate_fallback(query, evidence)
+            return
+        self.cache.set(key, "".join(pieces).strip(), ttl=3600, query=query, scope=scope)
+    
+    def _record_usage(self, chunk):
+        """Accumulate token counts from the final chunk of a stream, when reported"""
+        usage = getattr(chunk, "usage_metadata", None)
+        if usage is None:
+            return
+        self.token_usage["prompt_tokens"] += getattr(usage, "prompt_token_count", 0) or 0
+        self.token_usage["output_tokens"] += getattr(usage, "candidates_token_count", 0) or 0
+    
+    async def _agenerate_gemini(self, query: str, evidence: str) -> str:
+        """Generate answer using Google Gemini without blocking the event loop"""
+        key, scope = self._answer_cache_keys(query, evidence)
+        cached = self.cache.get(key, query=query, scope=scope)
+        if cached is not None:
+            return cached
+        
+        try:
+            answer = await self._single_flight(key, lambda: self.dispatcher.submit(
+                self._answer_prompt(query, evidence),
+                self._gen_cfg_answer
+            ))
+            self.cache.set(key, answer, ttl=3600, query=query, scope=scope)
+            return answer
         except Exception as e:
             print(f"Gemini error: {e}")
             return self._generate_fallback(query, evidence)
     
+    async def _single_flight(self, key: str, call) -> str:
+        """Run call() once per key; concurrent callers with the same key share its result.
+        The call runs as its own task, so a cancelled caller never cancels the others."""
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.create_task(call())
+            self._inflight[key] = task
+            task.add_done_callback(functools.partial(self._single_flight_done, key))
+        return await asyncio.shield(task)
+    
+    def _single_flight_done(self, key: str, task: asyncio.Task):
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        # Mark the exception retrieved so asyncio doesn't warn when every caller was cancelled
+        if not task.cancelled():
+            task.exception()
+    
     def _generate_local(self, query: str, evidence: str) -> str:
         """Generate answer using local model"""
-        prompt = f"Question: {query}\nEvidence: {evidence}\nAnswer:"
+        prompt = _LOCAL_PROMPT_TMPL.format_map({"q": query, "e": evidence})
         
         try:
             response = self.local_pipeline(
                 prompt,
-                max_length=int(os.getenv("LOCAL_MAX_LENGTH", "800")),
+                max_length=self.local_max_length,
                 do_sample=True,
                 temperature=0.7,
             )
@@ -199,26 +887,67 @@ Answer:"""
         """Simple fallback when no LLM is available"""
         return f"Based on the available evidence:\n{evidence}\n\nThis is a summary of relevant information. For more detailed advice, please consult local agricultural experts."
 
+    def _translation_prompt(self, text: str, language: str) -> str:
+        return _TRANSLATION_PROMPT_TMPL.format_map({"lang": language, "text": text})
+    
+    def _can_translate_locally(self, language: str) -> bool:
+        translator = get_local_translator()
+        return translator is not None and translator.supports(language)
+    
     def _translate_text(self, text: str, language: str) -> str:
-        """Translate English text to target language using the available LLM (best-effort)."""
+        """Translate English text to target language, locally when a model is configured (best-effort)."""
         if not text.strip():
             return text
+        if self._can_translate_locally(language):
+            try:
+                return get_local_translator().translate(text, language)
+            except Exception as e:
+                print(f"Local translation error, falling back: {e}")
         # If Gemini available, request translation; otherwise simple passthrough
         if self.gemini_model:
             try:
-                prompt = (
-                    f"Translate the following response from English to {language} (Indian locale if applicable).\n"
-                    f"Preserve meaning and formatting, keep units and numbers.\n\n{text}"
-                )
+                prompt = self._translation_prompt(text, language)
+                self.rate_limiter.throttle_sync(prompt)
                 response = self.gemini_model.generate_content(
                     prompt,
-                    generation_config=genai.types.GenerationConfig(
-                        max_output_tokens=int(os.getenv("GEMINI_MAX_OUTPUT_TOKENS", "1200")),
-                        temperature=0.2,
-                    ),
+                    generation_config=self._gen_cfg_translate,
                 )
                 return response.text.strip()
             except Exception as e:
                 print(f"Translation error: {e}")
                 return text
         return text
+    
+    async def _atranslate_text(self, text: str, language: str) -> str:
+        """Async variant of _translate_text that goes through the dispatcher"""
+        if not text.strip():
+            return text
+        if self._can_translate_locally(language):
+            try:
+                return await asyncio.to_thread(get_local_translator().translate, text, language)
+            except Exception as e:
+                print(f"Local translation error, falling back: {e}")
+        if not self.gemini_model:
+            return text
+        try:
+            return await self.dispatcher.submit(
+                self._translation_prompt(text, language),
+                self._gen_cfg_translate,
+            )
+        except Exception as e:
+            print(f"Translation error: {e}")
+            return text
+
+
+_llm_client: LLMClient | None = None
+_llm_client_lock = threading.Lock()
+
+
+def get_llm_client() -> LLMClient:
+    """Return the process-wide LLMClient, creating it on first use"""
+    global _llm_client
+    if _llm_client is None:
+        with _llm_client_lock:
+            if _llm_client is None:
+                _llm_client = LLMClient()
+    return _llm_client
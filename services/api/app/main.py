@@ -1,8 +1,12 @@
 from fastapi import FastAPI, Request, Depends, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from starlette.concurrency import run_in_threadpool
 from pydantic import BaseModel
 import os
-from typing import Optional, List
+import time
+import asyncio
+import functools
+from typing import Any, NamedTuple, Optional, List
 from datetime import datetime
 
 # Load environment variables from .env file
@@ -34,11 +38,15 @@ try:
     from sentence_transformers import SentenceTransformer  # type: ignore
 except Exception:  # pragma: no cover
     SentenceTransformer = None  # type: ignore
+try:
+    import simsimd  # type: ignore
+except Exception:  # pragma: no cover
+    simsimd = None  # type: ignore
 from sklearn.feature_extraction.text import TfidfVectorizer
 try:
-    from .llm_client import LLMClient
-    from .etl_service import ETLService
-    from .supervisor import SupervisorAgent
+    from .llm_client import get_llm_client, get_local_translator
+    from .etl_service import etl_service
+    from .supervisor import get_supervisor
     from .analytics import AnalyticsService
     from .realtime_data import RealTimeDataService
     from .monitoring import metrics_collector, health_checker
@@ -49,16 +57,23 @@ except ImportError:
     import sys
     import os
     sys.path.append(os.path.dirname(os.path.abspath(__file__)))
-    from llm_client import LLMClient
-    from etl_service import ETLService
-    from supervisor import SupervisorAgent
+    from llm_client import get_llm_client, get_local_translator
+    from etl_service import etl_service
+    from supervisor import get_supervisor
     from analytics import AnalyticsService
     from realtime_data import RealTimeDataService
     from monitoring import metrics_collector, health_checker
     from cache import get_cache_service, cache_query_result
     from security import limiter, security_manager, apply_rate_limit, get_client_ip, api_key_header
 
-app = FastAPI(title="Agri Advisor API", version="0.1.0")
+# orjson serializes the nested evidence/metrics payloads several times faster
+try:
+    import orjson  # noqa: F401
+    from fastapi.responses import ORJSONResponse as DefaultResponse
+except ImportError:
+    from fastapi.responses import JSONResponse as DefaultResponse
+
+app = FastAPI(title="Agri Advisor API", version="0.1.0", default_response_class=DefaultResponse)
 
 # Add rate limiter if available
 if limiter:
@@ -84,13 +99,27 @@ class Query(BaseModel):
 
 
 def get_qdrant_client():
+    """Shared client so requests reuse its connection pool"""
+    global _qdrant_client
     if QdrantClient is None:
         raise RuntimeError("qdrant-client not installed")
-    url = os.getenv("QDRANT_URL", "http://localhost:6333")
-    return QdrantClient(url=url)
+    if _qdrant_client is None:
+        url = os.getenv("QDRANT_URL", "http://localhost:6333")
+        _qdrant_client = QdrantClient(
+            url=url,
+            # gRPC (port 6334) multiplexes requests over one HTTP/2 connection
+            prefer_grpc=os.getenv("QDRANT_PREFER_GRPC", "0") == "1",
+            timeout=int(os.getenv("QDRANT_TIMEOUT", "5")),
+        )
+    return _qdrant_client
 
 
 COLLECTION_NAME = "agri_docs"
+# "i8" stores the local fallback embeddings as int8 (4x less memory to scan)
+EMBED_QUANT = os.getenv("EMBED_QUANT", "f32").lower()
+EMBED_BATCH_SIZE = int(os.getenv("EMBED_BATCH_SIZE", "64"))
+# Append live weather/market advice to /query answers when location or crop is given
+REALTIME_INSIGHTS = os.getenv("REALTIME_INSIGHTS", "0") == "1"
 
 
 def ensure_collection_exists():
@@ -104,58 +133,117 @@ def ensure_collection_exists():
                 collection_name=COLLECTION_NAME,
                 vectors_config=VectorParams(size=384, distance=Distance.COSINE),
             )
+        _mark_qdrant(True)
     except Exception as exc:
         # Likely Qdrant not reachable in dev; continue with local fallback
+        _mark_qdrant(False)
         print(f"Qdrant not available, will use local fallback. Detail: {exc}")
 
 
+def _mark_qdrant(up: bool):
+    global _qdrant_up, _qdrant_checked_at
+    _qdrant_up = up
+    _qdrant_checked_at = time.monotonic()
+
+
+def _qdrant_available() -> bool:
+    """Whether to try Qdrant; after a failure, retry only every QDRANT_RETRY_SECONDS"""
+    return _qdrant_up or time.monotonic() - _qdrant_checked_at >= QDRANT_RETRY_SECONDS
+
+
 # Lazy global model to avoid reloading per request
 _embedding_model = None
-_llm_client = None
-_etl_service = None
-_coordinator = None
+_embedding_model_loaded = False
+_qdrant_client = None
+_qdrant_up = False
+_qdrant_checked_at = float("-inf")
+QDRANT_RETRY_SECONDS = float(os.getenv("QDRANT_RETRY_SECONDS", "30"))
 _analytics_service = None
 _realtime_data_service = None
-_local_docs = []
-_local_doc_vectors: np.ndarray | None = None
-_tfidf_vectorizer: TfidfVectorizer | None = None
+
+
+class LocalIndex(NamedTuple):
+    """In-memory fallback corpus; row i of every column and of vectors is document i.
+    Rebuilt off the event loop and swapped in as one object, so readers never mix
+    columns and vectors from different ingests."""
+    texts: List[str]
+    sources: List[str]
+    dates: List[str]
+    geos: List[str]
+    crops: List[str]
+    # Dense embeddings, or the TF-IDF matrix when sentence-transformers is missing
+    vectors: Any = None
+    tfidf_vectorizer: TfidfVectorizer | None = None
+    tfidf_term_docs: Any = None
+
+
+_local_index: LocalIndex | None = None
 
 
 def get_embedding_model():
-    global _embedding_model
+    """The ONNX embedder when EMBEDDING_ONNX_DIR is set, else SentenceTransformer, else None"""
+    global _embedding_model, _embedding_model_loaded
+    if _embedding_model_loaded:
+        return _embedding_model
+    # An ONNX-only deployment doesn't need sentence-transformers installed
+    onnx_dir = os.getenv("EMBEDDING_ONNX_DIR")
+    if onnx_dir:
+        try:
+            try:
+                from .onnx_embedder import OnnxEmbedder
+            except ImportError:
+                from onnx_embedder import OnnxEmbedder
+            _embedding_model = OnnxEmbedder(onnx_dir)
+        except Exception as e:
+            print(f"ONNX embedder unavailable, trying SentenceTransformer: {e}")
     if _embedding_model is None and SentenceTransformer is not None:
         model_name = os.getenv("EMBEDDING_MODEL", "all-MiniLM-L6-v2")
         _embedding_model = SentenceTransformer(model_name)
+    _embedding_model_loaded = True
     return _embedding_model
 
 
-def get_llm_client():
-    global _llm_client
-    if _llm_client is None:
-        _llm_client = LLMClient()
-    return _llm_client
+def _dense_embeddings_available() -> bool:
+    return get_embedding_model() is not None
 
 
-def get_etl_service():
-    global _etl_service
-    if _etl_service is None:
-        _etl_service = ETLService()
-    return _etl_service
+@functools.lru_cache(maxsize=int(os.getenv("QUERY_EMBED_CACHE_SIZE", "4096")))
+def _encode_text_bytes(text: str) -> bytes:
+    q_vec = np.asarray(get_embedding_model().encode(text), dtype=np.float32)
+    return (q_vec / (np.linalg.norm(q_vec) + 1e-12)).tobytes()
 
 
-def get_local_docs():
-    global _local_docs
-    if not _local_docs:
-        etl_service = get_etl_service()
-        _local_docs = etl_service.get_all_data()
-    return _local_docs
+def encode_query(text: str) -> np.ndarray:
+    """Normalized query embedding, memoized by text (location/crop filters apply later)"""
+    # Cached as immutable bytes; the returned view is read-only
+    return np.frombuffer(_encode_text_bytes(text), dtype=np.float32)
 
 
-def get_supervisor():
-    global _coordinator
-    if _coordinator is None:
-        _coordinator = SupervisorAgent()
-    return _coordinator
+def get_etl_service():
+    return etl_service
+
+
+def _build_local_index(docs) -> LocalIndex:
+    """Split documents into parallel field lists and index them; blocking, run it off-loop"""
+    texts = [d["text"] for d in docs]
+    metas = [d["meta"] for d in docs]
+    columns = dict(
+        texts=texts,
+        sources=[m["source"] for m in metas],
+        dates=[m["date"] for m in metas],
+        geos=[m["geo"] for m in metas],
+        crops=[m["crop"] for m in metas],
+    )
+    if not texts:
+        return LocalIndex(**columns)
+    if _dense_embeddings_available():
+        vectors = _index_embeddings(_encode_documents(get_embedding_model(), texts))
+        return LocalIndex(**columns, vectors=vectors)
+    # TF-IDF fallback that does not require heavy deps; rows come out L2-normalized
+    vect = TfidfVectorizer(max_features=2048, norm="l2")
+    mat = vect.fit_transform(texts).tocsr()
+    # Term-major copy: a query row times this touches only the postings of its terms
+    return LocalIndex(**columns, vectors=mat, tfidf_vectorizer=vect, tfidf_term_docs=mat.T.tocsr())
 
 
 def get_analytics_service():
@@ -222,76 +310,133 @@ async def root():
     return {"message": "Agri Advisor API is running. Use GET /query?text=... or POST /query."}
 
 
+def _limit_torch_threads():
+    """Split CPU cores between workers so threadpool encodes don't oversubscribe"""
+    if SentenceTransformer is None:
+        return
+    try:
+        import torch
+        workers = int(os.getenv("WEB_CONCURRENCY", "1"))
+        torch.set_num_threads(max(1, (os.cpu_count() or 1) // max(1, workers)))
+    except Exception as e:
+        print(f"Could not set torch thread count: {e}")
+
+
 @app.on_event("startup")
 async def startup_event():
+    global _local_index
     try:
         ensure_collection_exists()
     except Exception as e:
         # Do not crash API if Qdrant not ready; health endpoint can be used to check
         print(f"Startup warning: {e}")
+    # Load the local translation model (if configured) before the first request needs it
+    get_local_translator()
+    _limit_torch_threads()
     # prepare local fallback vectors (either ST or TF-IDF)
-    local_docs = get_local_docs()
-    texts = [d["text"] for d in local_docs]
-    if texts:
-        if SentenceTransformer is not None:
-            model = get_embedding_model()
-            vecs = model.encode(texts)
-            norms = np.linalg.norm(vecs, axis=1, keepdims=True) + 1e-12
-            globals()["_local_doc_vectors"] = (vecs / norms).astype(np.float32)
-        else:
-            # TF-IDF fallback that does not require heavy deps
-            vect = TfidfVectorizer(max_features=2048)
-            mat = vect.fit_transform(texts)
-            # L2 normalize rows
-            row_norms = np.sqrt((mat.multiply(mat)).sum(axis=1)) + 1e-12
-            mat = mat.multiply(1.0 / row_norms)
-            globals()["_tfidf_vectorizer"] = vect
-            globals()["_local_doc_vectors"] = mat
-
-
-def _run_query(q: Query, request=None):
-    import time
-    start_time = time.time()
-    
-    # Check cache first
-    cache_service = get_cache_service()
-    cache_key = cache_service._generate_cache_key(
-        "query",
-        text=q.text,
-        location=q.location or "",
-        crop=q.crop or ""
+    _local_index = await run_in_threadpool(_build_local_index, get_etl_service().get_all_data())
+    if _local_index.texts and _dense_embeddings_available():
+        # Let the LLM response cache match near-duplicate queries
+        get_llm_client().cache.embedder = encode_query
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    # Release pooled outbound connections
+    if _realtime_data_service is not None:
+        await _realtime_data_service.close()
+
+
+def _quantize_i8(vecs: np.ndarray) -> np.ndarray:
+    """Symmetric per-vector int8 quantization; cosine is unaffected by the row scale"""
+    scale = 127.0 / (np.max(np.abs(vecs), axis=-1, keepdims=True) + 1e-12)
+    return np.ascontiguousarray(np.round(vecs * scale), dtype=np.int8)
+
+
+def _encode_documents(model, texts: List[str]) -> np.ndarray:
+    """Batch-encode documents into unit-length float32 rows"""
+    # The encoder sorts by length so each batch pads to a similar size
+    return model.encode(
+        texts,
+        batch_size=EMBED_BATCH_SIZE,
+        show_progress_bar=False,
+        convert_to_numpy=True,
+        normalize_embeddings=True,
     )
-    
-    cached_result = cache_service.get(cache_key)
-    if cached_result:
-        # Add cache hit info and record metrics
-        cached_result["cache_hit"] = True
-        metrics_collector.record_query(
-            query=q.text,
-            location=q.location,
-            crop=q.crop,
-            response_time=0.001,  # Cache hit is very fast
-            agent_used=cached_result.get("agent_used"),
-            success=True
-        )
-        return cached_result
-    
-    # Get services
-    analytics_service = get_analytics_service()
-    realtime_service = get_realtime_data_service()
-    
+
+
+def _aligned_empty(shape, dtype=np.float32, align: int = 64) -> np.ndarray:
+    """Uninitialized C-contiguous array whose data starts on an align-byte boundary"""
+    dtype = np.dtype(dtype)
+    count = int(np.prod(shape))
+    buf = np.empty(count * dtype.itemsize + align, dtype=np.uint8)
+    offset = (-buf.ctypes.data) % align
+    # The view keeps buf alive through its .base
+    return np.frombuffer(buf, dtype=dtype, count=count, offset=offset).reshape(shape)
+
+
+def _index_embeddings(vecs: np.ndarray) -> np.ndarray:
+    """Prepare normalized document embeddings for the in-memory fallback index"""
+    vecs = np.asarray(vecs, dtype=np.float32)
+    if EMBED_QUANT == "i8":
+        vecs = _quantize_i8(vecs)
+    # One 64-byte aligned block so the SIMD scan gets aligned full-width loads
+    index = _aligned_empty(vecs.shape, vecs.dtype)
+    np.copyto(index, vecs)
+    return index
+
+
+def _cosine_scores(vecs: np.ndarray, q_vec: np.ndarray) -> np.ndarray:
+    """Cosine similarity of q_vec against every row of vecs"""
+    q_vec = np.ascontiguousarray(q_vec, dtype=np.float32)
+    if vecs.dtype == np.int8:
+        q_vec = _quantize_i8(q_vec)
+    if simsimd is not None:
+        # SIMD kernel normalizes internally, so the raw query vector is fine
+        return 1.0 - np.asarray(simsimd.cdist(q_vec[None, :], vecs, metric="cosine")).ravel()
+    if vecs.dtype == np.int8:
+        rows = vecs.astype(np.float32)
+        q_vec = q_vec.astype(np.float32)
+        return (rows @ q_vec) / (np.linalg.norm(rows, axis=1) * np.linalg.norm(q_vec) + 1e-12)
+    q_norm = q_vec / (np.linalg.norm(q_vec) + 1e-12)
+    return vecs @ q_norm
+
+
+def _top_k(scores: np.ndarray, k: int) -> np.ndarray:
+    """Indices of the k highest scores, best first, without sorting every score"""
+    k = min(k, scores.size)
+    if k == scores.size:
+        return np.argsort(-scores)
+    top = np.argpartition(-scores, k - 1)[:k]
+    return top[np.argsort(-scores[top])]
+
+
+def _tfidf_top_k(term_docs, q_vec_tfidf, k: int):
+    """Top-k cosine matches (rows are normalized) without densifying the score row"""
+    row = (q_vec_tfidf @ term_docs).tocsr()
+    hits, vals = row.indices, row.data
+    if hits.size < k:
+        # Too few documents share a term with the query; rank everything
+        sims = row.toarray().ravel()
+        top = _top_k(sims, k)
+        return top, sims[top]
+    top = _top_k(vals, k)
+    return hits[top], vals[top]
+
+
+def _retrieve_evidence(q: Query):
+    """Retrieve top evidence from Qdrant, falling back to the in-memory index"""
     client = None
-    try:
-        client = get_qdrant_client()
-    except RuntimeError:
-        pass  # Use local fallback
-    q_norm = None
-    query_vec = None
-    if SentenceTransformer is not None:
-        model = get_embedding_model()
-        q_vec = model.encode(q.text)
-        q_norm = q_vec / (np.linalg.norm(q_vec) + 1e-12)
-        query_vec = q_vec.tolist()
+    if _qdrant_available():
+        try:
+            client = get_qdrant_client()
+        except RuntimeError:
+            pass  # Use local fallback
+    # Only embed up front when Qdrant will be queried; the local fallback
+    # embeds lazily and the TF-IDF path never needs it
+    q_vec = None
+    if client is not None and _dense_embeddings_available():
+        q_vec = encode_query(q.text)
 
     must_conditions: List = []
     if q.location and FieldCondition is not None:
@@ -306,16 +451,21 @@ def _run_query(q: Query, request=None):
     evidence = []
     scores = []
     try:
-        if query_vec is None or client is None:
+        if q_vec is None or client is None:
             raise RuntimeError("No embedding model available for Qdrant query")
-        results = client.search(
-            collection_name=COLLECTION_NAME,
-            query_vector=query_vec,
-            limit=5,
-            query_filter=query_filter,
-            with_payload=True,
-            with_vectors=False,
-        )
+        try:
+            results = client.search(
+                collection_name=COLLECTION_NAME,
+                query_vector=q_vec.tolist(),
+                limit=5,
+                query_filter=query_filter,
+                with_payload=True,
+                with_vectors=False,
+            )
+        except Exception:
+            _mark_qdrant(False)
+            raise
+        _mark_qdrant(True)
         for r in results:
             payload = r.payload or {}
             evidence.append(
@@ -330,41 +480,67 @@ def _run_query(q: Query, request=None):
             )
             scores.append(r.score)
     except Exception:
-        # Local fallback using in-memory docs
-        local_docs = get_local_docs()
-        vecs = globals().get("_local_doc_vectors")
-        if vecs is not None:
-            if SentenceTransformer is not None and q_norm is not None and isinstance(vecs, np.ndarray):
-                sims = (vecs @ q_norm.astype(np.float32))
-            else:
+        # Local fallback using in-memory docs; read the snapshot once so a
+        # concurrent /ingest can't swap it mid-lookup
+        index = _local_index
+        if index is not None and index.vectors is not None:
+            topk_idx, topk_scores = np.array([], dtype=int), np.array([])
+            if isinstance(index.vectors, np.ndarray):
+                if q_vec is None:
+                    q_vec = encode_query(q.text)
+                sims = _cosine_scores(index.vectors, q_vec)
+                topk_idx = _top_k(sims, 5)
+                topk_scores = sims[topk_idx]
+            elif index.tfidf_vectorizer is not None:
                 # TF-IDF similarity
-                vect = globals().get("_tfidf_vectorizer")
-                if vect is None:
-                    sims = np.array([])
-                else:
-                    q_vec_tfidf = vect.transform([q.text])
-                    # cosine since vectors are normalized
-                    sims = (vecs @ q_vec_tfidf.T).toarray().ravel()
-            if sims.size > 0:
-                topk_idx = np.argsort(-sims)[:5]
-                for idx in topk_idx:
-                    d = local_docs[int(idx)]
-                    sc = float(sims[int(idx)])
+                topk_idx, topk_scores = _tfidf_top_k(index.tfidf_term_docs, index.tfidf_vectorizer.transform([q.text]), 5)
+            if topk_idx.size > 0:
+                for idx, sc in zip(topk_idx.tolist(), topk_scores.tolist()):
                     evidence.append(
                         {
-                            "source": d["meta"]["source"],
-                            "excerpt": d["text"],
-                            "date": d["meta"]["date"],
-                            "geo": d["meta"]["geo"],
-                            "crop": d["meta"]["crop"],
+                            "source": index.sources[idx],
+                            "excerpt": index.texts[idx],
+                            "date": index.dates[idx],
+                            "geo": index.geos[idx],
+                            "crop": index.crops[idx],
                             "score": sc,
                         }
                     )
                     scores.append(sc)
 
-    # Simple heuristic confidence: normalized mean score if available
-    confidence = float(sum(scores) / len(scores)) if scores else 0.0
+    return evidence, scores
 
+
+async def _run_query(q: Query, request=None):
+    start_time = time.time()
+    
+    # Check cache first
+    cache_service = get_cache_service()
+    cache_key = cache_service._generate_cache_key(
+        "query",
+        text=q.text,
+        location=q.location or "",
+        crop=q.crop or ""
+    )
+    
+    cached_result = cache_service.get(cache_key)
+    if cached_result:
+        # Add cache hit info and record metrics
+        cached_result["cache_hit"] = True
+        metrics_collector.record_query(
+            query=q.text,
+            location=q.location,
+            crop=q.crop,
+            response_time=0.001,  # Cache hit is very fast
+            agent_used=cached_result.get("agent_used"),
+            success=True
+        )
+        return cached_result
+    
+    # Get services
+    analytics_service = get_analytics_service()
+    realtime_service = get_realtime_data_service()
+    
     # Try supervisor first (LangGraph-based agent orchestration)
     supervisor = get_supervisor()
     
@@ -377,7 +553,20 @@ def _run_query(q: Query, request=None):
         import uuid
         session_id = str(uuid.uuid4())[:12]
     
-    supervisor_response = supervisor.process_query(q.text, q.location, q.crop, session_id)
+    # Retrieval, the supervisor and realtime lookups are independent; overlap them.
+    # Embedding and Qdrant search block, so they run in the threadpool
+    retrieval = run_in_threadpool(_retrieve_evidence, q)
+    supervision = supervisor.aprocess_query(q.text, q.location, q.crop, session_id)
+    if REALTIME_INSIGHTS and (q.location or q.crop):
+        (evidence, scores), supervisor_response, realtime_insights = await asyncio.gather(
+            retrieval, supervision, realtime_service.get_relevant_insights(q.location, q.crop)
+        )
+    else:
+        (evidence, scores), supervisor_response = await asyncio.gather(retrieval, supervision)
+        realtime_insights = []
+
+    # Simple heuristic confidence: normalized mean score if available
+    confidence = float(sum(scores) / len(scores)) if scores else 0.0
     
     # Calculate response time
     response_time = time.time() - start_time
@@ -409,17 +598,11 @@ def _run_query(q: Query, request=None):
             language = request.headers.get('Accept-Language')
             if language:
                 language = language.split(',')[0].split('-')[0].strip()
-        answer = llm_client.generate_answer(q.text, evidence, language=language)
+        answer = await llm_client.agenerate_answer(q.text, evidence, language=language)
         agent_used = "llm"
         confidence = round(confidence, 3)
     
-    # Add real-time data insights if relevant
-    realtime_insights = []
-    
-    # Realtime insight calls can cause event loop conflicts in ASGI if synchronous
-    # Disable inline realtime calls to avoid 500s; expose via dedicated endpoints instead
-    
-    # Combine insights with main answer
+    # Combine real-time insights (fetched alongside the supervisor) with main answer
     if realtime_insights:
         answer = f"{answer}\n\n📊 Real-time Updates:\n" + "\n".join(f"• {insight}" for insight in realtime_insights)
     
@@ -454,7 +637,7 @@ def _run_query(q: Query, request=None):
                     language = language.split(',')[0].split('-')[0].strip()
             if language and language != 'en':
                 llm_client = get_llm_client()
-                answer = llm_client._translate_text(answer, language)
+                answer = await llm_client._atranslate_text(answer, language)
         except Exception:
             pass
 
@@ -488,7 +671,7 @@ async def handle_query(request: Request, q: Query):
         if security_manager.is_ip_blocked(client_ip):
             raise HTTPException(status_code=403, detail="IP blocked due to suspicious activity")
         
-        return _run_query(q, request)
+        return await _run_query(q, request)
     except Exception as e:
         metrics_collector.record_query(
             query=q.text,
@@ -509,7 +692,7 @@ async def handle_query_get(request: Request, text: str, location: Optional[str]
         if security_manager.is_ip_blocked(client_ip):
             raise HTTPException(status_code=403, detail="IP blocked due to suspicious activity")
         
-        return _run_query(q, request)
+        return await _run_query(q, request)
     except Exception as e:
         metrics_collector.record_query(
             query=q.text,
@@ -520,29 +703,33 @@ async def handle_query_get(request: Request, text: str, location: Optional[str]
         return {"error": str(e), "status": "failed"}
 
 
+@app.get("/query/stream")
+@apply_rate_limit("10/minute")
+async def handle_query_stream(request: Request, text: str, location: Optional[str] = None, crop: Optional[str] = None):
+    """Stream an evidence-grounded LLM answer as it is generated"""
+    from fastapi.responses import StreamingResponse
+    q = Query(text=text, location=location, crop=crop)
+    client_ip = get_client_ip(request)
+    if security_manager.is_ip_blocked(client_ip):
+        raise HTTPException(status_code=403, detail="IP blocked due to suspicious activity")
+    
+    evidence, _ = await run_in_threadpool(_retrieve_evidence, q)
+    return StreamingResponse(
+        get_llm_client().astream_answer(q.text, evidence),
+        media_type="text/plain"
+    )
+
+
 @app.post("/ingest")
 @apply_rate_limit("5/hour")
 async def ingest_data(request: Request, api_key: Optional[str] = Depends(api_key_header)):
     """Ingest agricultural data"""
+    global _local_index
     try:
-        etl_service = get_etl_service()
-        data = etl_service.get_all_data()
+        data = await get_etl_service().aget_all_data()
         
-        # Rebuild vectors with new data
-        texts = [d["text"] for d in data]
-        if texts:
-            if SentenceTransformer is not None:
-                model = get_embedding_model()
-                vecs = model.encode(texts)
-                norms = np.linalg.norm(vecs, axis=1, keepdims=True) + 1e-12
-                globals()["_local_doc_vectors"] = (vecs / norms).astype(np.float32)
-            else:
-                vect = TfidfVectorizer(max_features=2048)
-                mat = vect.fit_transform(texts)
-                row_norms = np.sqrt((mat.multiply(mat)).sum(axis=1)) + 1e-12
-                mat = mat.multiply(1.0 / row_norms)
-                globals()["_tfidf_vectorizer"] = vect
-                globals()["_local_doc_vectors"] = mat
+        # Rebuild vectors with new data off the event loop, then swap the whole index in
+        _local_index = await run_in_threadpool(_build_local_index, data)
         
         return {"message": f"Ingested {len(data)} documents", "count": len(data)}
     except Exception as e:
@@ -554,7 +741,7 @@ async def test_supervisor(text: str, location: Optional[str] = None, crop: Optio
     """Test supervisor system directly with LangGraph workflow"""
     try:
         supervisor = get_supervisor()
-        response = supervisor.process_query(text, location, crop)
+        response = await supervisor.aprocess_query(text, location, crop)
         return {
             "query": text,
             "location": location,
@@ -567,12 +754,26 @@ async def test_supervisor(text: str, location: Optional[str] = None, crop: Optio
     except Exception as e:
         return {"error": str(e)}
 
+@app.get("/supervisor/stream")
+@apply_rate_limit("10/minute")
+async def handle_supervisor_stream(request: Request, text: str, location: Optional[str] = None, crop: Optional[str] = None):
+    """Stream the supervisor's answer as it is synthesized, followed by a JSON trailer"""
+    from fastapi.responses import StreamingResponse
+    client_ip = get_client_ip(request)
+    if security_manager.is_ip_blocked(client_ip):
+        raise HTTPException(status_code=403, detail="IP blocked due to suspicious activity")
+    
+    return StreamingResponse(
+        get_supervisor().process_query_stream(text, location, crop),
+        media_type="text/plain"
+    )
+
 @app.get("/agents")
 async def test_agents(text: str, location: Optional[str] = None, crop: Optional[str] = None):
     """Test agent responses directly (legacy endpoint)"""
     try:
         supervisor = get_supervisor()
-        response = supervisor.process_query(text, location, crop)
+        response = await supervisor.aprocess_query(text, location, crop)
         return response
     except Exception as e:
         return {"error": str(e)}
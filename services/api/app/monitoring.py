@@ -2,11 +2,15 @@
 Monitoring and metrics service for production readiness
 """
 
+import io
 import time
+import queue
+import atexit
 import logging
+import logging.handlers
 from typing import Dict, Any, Optional
 from datetime import datetime, timedelta
-from collections import defaultdict, Counter
+from collections import defaultdict, Counter, deque
 import asyncio
 import psutil
 import json
@@ -17,27 +21,92 @@ log_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__)
 os.makedirs(log_dir, exist_ok=True)
 log_file = os.path.join(log_dir, 'app.log')
 
+# Request handlers only enqueue records; a listener thread does the file/stdout
+# writes so a slow flush never blocks the event loop
+_log_formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+_log_handlers = [logging.FileHandler(log_file), logging.StreamHandler()]
+for _handler in _log_handlers:
+    _handler.setFormatter(_log_formatter)
+_log_queue = queue.SimpleQueue()
+_log_listener = logging.handlers.QueueListener(_log_queue, *_log_handlers, respect_handler_level=True)
+_queue_handler = logging.handlers.QueueHandler(_log_queue)
+# Keep the bare message on the queue; the listener's handlers add the prefix
+_queue_handler.setFormatter(logging.Formatter('%(message)s'))
+
 logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler(log_file),
-        logging.StreamHandler()
-    ]
+    level=os.getenv("LOG_LEVEL", "INFO").upper(),
+    handlers=[_queue_handler]
 )
+_log_listener.start()
+atexit.register(_log_listener.stop)
 
 logger = logging.getLogger(__name__)
 
+# Prime psutil's CPU counters so later cpu_percent(interval=None) calls
+# return the usage since the previous call instead of sleeping to sample
+psutil.cpu_percent(interval=None)
+
+SYSTEM_SAMPLE_TTL = 5.0  # seconds; scrapes inside this window reuse one sample
+_system_sample = (0.0, None)
+
+
+def _sample_system():
+    """CPU, memory and disk usage, re-read from psutil at most every SYSTEM_SAMPLE_TTL"""
+    global _system_sample
+    sampled_at, sample = _system_sample
+    now = time.monotonic()
+    if sample is None or now - sampled_at >= SYSTEM_SAMPLE_TTL:
+        sample = (psutil.cpu_percent(interval=None), psutil.virtual_memory(), psutil.disk_usage('/'))
+        _system_sample = (now, sample)
+    return sample
+
+_PROMETHEUS_HEADER_TMPL = """# HELP agri_advisor_queries_total Total number of queries
+# TYPE agri_advisor_queries_total counter
+agri_advisor_queries_total {queries}
+
+# HELP agri_advisor_errors_total Total number of errors
+# TYPE agri_advisor_errors_total counter
+agri_advisor_errors_total {errors}
+
+# HELP agri_advisor_response_time_avg Average response time in seconds
+# TYPE agri_advisor_response_time_avg gauge
+agri_advisor_response_time_avg {avg_response_time}
+
+# HELP agri_advisor_error_rate Error rate percentage
+# TYPE agri_advisor_error_rate gauge
+agri_advisor_error_rate {error_rate}
+
+# HELP agri_advisor_cpu_usage CPU usage percentage
+# TYPE agri_advisor_cpu_usage gauge
+agri_advisor_cpu_usage {cpu}
+
+# HELP agri_advisor_memory_usage Memory usage percentage
+# TYPE agri_advisor_memory_usage gauge
+agri_advisor_memory_usage {memory}
+"""
+
+_PROMETHEUS_AGENT_TMPL = """
+# HELP agri_advisor_agent_usage_{agent} Usage count for {agent}
+# TYPE agri_advisor_agent_usage_{agent} counter
+agri_advisor_agent_usage_{agent} {count}
+"""
+
+
 class MetricsCollector:
     """Collect and expose application metrics"""
     
     def __init__(self):
         self.query_count = 0
         self.error_count = 0
-        self.response_times = []
+        # Only the last 1000 response times are kept for memory efficiency
+        self.response_times = deque(maxlen=1000)
+        self._response_time_sum = 0.0
         self.agent_usage = Counter()
         self.location_queries = Counter()
         self.crop_queries = Counter()
+        # Top-10 views of the counters, rebuilt lazily after a new location/crop is seen
+        self._top_locations = None
+        self._top_crops = None
         self.daily_stats = defaultdict(lambda: defaultdict(int))
         
     def record_query(self, query: str, location: str = None, crop: str = None, 
@@ -49,19 +118,21 @@ class MetricsCollector:
             self.error_count += 1
             
         if response_time > 0:
+            if len(self.response_times) == self.response_times.maxlen:
+                self._response_time_sum -= self.response_times[0]
+            self._response_time_sum += response_time
             self.response_times.append(response_time)
-            # Keep only last 1000 response times for memory efficiency
-            if len(self.response_times) > 1000:
-                self.response_times = self.response_times[-1000:]
         
         if agent_used:
             self.agent_usage[agent_used] += 1
             
         if location:
             self.location_queries[location] += 1
+            self._top_locations = None
             
         if crop:
             self.crop_queries[crop] += 1
+            self._top_crops = None
             
         # Daily stats
         today = datetime.now().strftime('%Y-%m-%d')
@@ -73,7 +144,7 @@ class MetricsCollector:
     
     def get_metrics(self) -> Dict[str, Any]:
         """Get current metrics"""
-        avg_response_time = sum(self.response_times) / len(self.response_times) if self.response_times else 0
+        avg_response_time = self._response_time_sum / len(self.response_times) if self.response_times else 0
         
         return {
             "total_queries": self.query_count,
@@ -81,18 +152,26 @@ class MetricsCollector:
             "error_rate": self.error_count / max(self.query_count, 1),
             "avg_response_time": round(avg_response_time, 3),
             "agent_usage": dict(self.agent_usage),
-            "top_locations": dict(self.location_queries.most_common(10)),
-            "top_crops": dict(self.crop_queries.most_common(10)),
+            "top_locations": self._top_location_counts(),
+            "top_crops": self._top_crop_counts(),
             "daily_stats": dict(self.daily_stats),
             "system_health": self.get_system_health()
         }
     
+    def _top_location_counts(self) -> Dict[str, int]:
+        if self._top_locations is None:
+            self._top_locations = dict(self.location_queries.most_common(10))
+        return self._top_locations
+    
+    def _top_crop_counts(self) -> Dict[str, int]:
+        if self._top_crops is None:
+            self._top_crops = dict(self.crop_queries.most_common(10))
+        return self._top_crops
+    
     def get_system_health(self) -> Dict[str, Any]:
         """Get system health metrics"""
         try:
-            cpu_percent = psutil.cpu_percent(interval=1)
-            memory = psutil.virtual_memory()
-            disk = psutil.disk_usage('/')
+            cpu_percent, memory, disk = _sample_system()
             
             return {
                 "cpu_usage_percent": cpu_percent,
@@ -108,42 +187,23 @@ class MetricsCollector:
     
     def export_prometheus_metrics(self) -> str:
         """Export metrics in Prometheus format"""
-        metrics = self.get_metrics()
-        
-        prometheus_format = f"""# HELP agri_advisor_queries_total Total number of queries
-# TYPE agri_advisor_queries_total counter
-agri_advisor_queries_total {metrics['total_queries']}
-
-# HELP agri_advisor_errors_total Total number of errors
-# TYPE agri_advisor_errors_total counter
-agri_advisor_errors_total {metrics['total_errors']}
-
-# HELP agri_advisor_response_time_avg Average response time in seconds
-# TYPE agri_advisor_response_time_avg gauge
-agri_advisor_response_time_avg {metrics['avg_response_time']}
-
-# HELP agri_advisor_error_rate Error rate percentage
-# TYPE agri_advisor_error_rate gauge
-agri_advisor_error_rate {metrics['error_rate']}
-
-# HELP agri_advisor_cpu_usage CPU usage percentage
-# TYPE agri_advisor_cpu_usage gauge
-agri_advisor_cpu_usage {metrics['system_health'].get('cpu_usage_percent', 0)}
-
-# HELP agri_advisor_memory_usage Memory usage percentage
-# TYPE agri_advisor_memory_usage gauge
-agri_advisor_memory_usage {metrics['system_health'].get('memory_usage_percent', 0)}
-"""
-        
-        # Add agent usage metrics
-        for agent, count in metrics['agent_usage'].items():
-            prometheus_format += f"""
-# HELP agri_advisor_agent_usage_{agent} Usage count for {agent}
-# TYPE agri_advisor_agent_usage_{agent} counter
-agri_advisor_agent_usage_{agent} {count}
-"""
-        
-        return prometheus_format
+        # Read the counters directly; get_metrics() would build (and copy
+        # daily_stats into) a dict that is thrown away straight after
+        avg_response_time = self._response_time_sum / len(self.response_times) if self.response_times else 0
+        # Guarded like /health, so a psutil failure reports 0 instead of failing /metrics
+        health = self.get_system_health()
+        out = io.StringIO()
+        out.write(_PROMETHEUS_HEADER_TMPL.format(
+            queries=self.query_count,
+            errors=self.error_count,
+            avg_response_time=round(avg_response_time, 3),
+            error_rate=self.error_count / max(self.query_count, 1),
+            cpu=health.get("cpu_usage_percent", 0),
+            memory=health.get("memory_usage_percent", 0),
+        ))
+        for agent, count in self.agent_usage.items():
+            out.write(_PROMETHEUS_AGENT_TMPL.format(agent=agent, count=count))
+        return out.getvalue()
 
 class HealthChecker:
     """Health check service for production monitoring"""
@@ -153,7 +213,7 @@ class HealthChecker:
         self.last_check_time = None
         
     async def check_health(self) -> Dict[str, Any]:
-        """Run all health checks"""
+        """Run all health checks concurrently"""
         self.last_check_time = datetime.now()
         
         results = {
@@ -162,46 +222,51 @@ class HealthChecker:
             "checks": {}
         }
         
-        # Database connectivity
+        checks = await asyncio.gather(
+            self._check_qdrant(),
+            self._check_llm(),
+            self._check_system(),
+        )
+        for name, check, healthy in checks:
+            results["checks"][name] = check
+            if not healthy:
+                results["status"] = "degraded"
+        
+        return results
+    
+    async def _check_qdrant(self):
+        """Database connectivity"""
         try:
             from .main import get_qdrant_client
             client = get_qdrant_client()
-            await asyncio.sleep(0.1)  # Simulate async check
-            results["checks"]["qdrant"] = {"status": "up", "message": "Connected"}
+            await asyncio.wait_for(asyncio.to_thread(client.get_collections), timeout=2)
+            return "qdrant", {"status": "up", "message": "Connected"}, True
         except Exception as e:
-            results["checks"]["qdrant"] = {"status": "down", "error": str(e)}
-            results["status"] = "degraded"
-        
-        # LLM service
+            return "qdrant", {"status": "down", "error": str(e) or type(e).__name__}, False
+    
+    async def _check_llm(self):
+        """LLM service"""
         try:
-            from .llm_client import LLMClient
-            llm = LLMClient()
+            from .llm_client import get_llm_client
+            llm = get_llm_client()
             if llm.gemini_model:
-                results["checks"]["llm"] = {"status": "up", "provider": "gemini"}
-            else:
-                results["checks"]["llm"] = {"status": "fallback", "provider": "local"}
+                return "llm", {"status": "up", "provider": "gemini"}, True
+            return "llm", {"status": "fallback", "provider": "local"}, True
         except Exception as e:
-            results["checks"]["llm"] = {"status": "down", "error": str(e)}
-            results["status"] = "degraded"
-        
-        # System resources
+            return "llm", {"status": "down", "error": str(e)}, False
+    
+    async def _check_system(self):
+        """System resources"""
         try:
-            cpu = psutil.cpu_percent()
-            memory = psutil.virtual_memory()
-            
-            if cpu > 90 or memory.percent > 90:
-                results["status"] = "degraded"
-                
-            results["checks"]["system"] = {
+            cpu, memory, _ = _sample_system()
+            check = {
                 "status": "up",
                 "cpu_percent": cpu,
                 "memory_percent": memory.percent
             }
+            return "system", check, cpu <= 90 and memory.percent <= 90
         except Exception as e:
-            results["checks"]["system"] = {"status": "down", "error": str(e)}
-            results["status"] = "degraded"
-        
-        return results
+            return "system", {"status": "down", "error": str(e)}, False
 
 # Global instances
 metrics_collector = MetricsCollector()
@@ -7,14 +7,23 @@ import json
 from datetime import datetime, timedelta
 from typing import Dict, List, Any, Optional
 import os
-from dataclasses import dataclass
+from dataclasses import dataclass, replace
+from collections import OrderedDict
 import logging
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
+import numpy as np
+
+# orjson parses large agmarknet payloads several times faster than the stdlib
+try:
+    import orjson
+    _loads = orjson.loads
+except ImportError:
+    _loads = json.loads
+
+# Handlers and level are configured once by the app (see monitoring.py)
 logger = logging.getLogger(__name__)
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class WeatherData:
     location: str
     temperature: float
@@ -24,7 +33,7 @@ class WeatherData:
     forecast: List[Dict[str, Any]]
     timestamp: datetime
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class MarketData:
     crop: str
     location: str
@@ -34,11 +43,72 @@ class MarketData:
     volume: Optional[float]
     timestamp: datetime
 
+def market_array(data: List[MarketData], field: str) -> np.ndarray:
+    """One numeric field of market rows as a float64 array for vectorized stats"""
+    return np.fromiter((getattr(d, field) for d in data), dtype=np.float64, count=len(data))
+
+# Weather advice as (predicate(temperature, humidity, rainfall, wind_speed, crop), message),
+# applied in order; crop is lowercased or None
+WEATHER_ADVICE_RULES = (
+    # Temperature
+    (lambda t, h, r, w, crop: t > 35, "High temperature alert: Consider shade nets and frequent irrigation."),
+    (lambda t, h, r, w, crop: t < 15, "Low temperature: Protect crops with mulching and row covers."),
+    # Rainfall
+    (lambda t, h, r, w, crop: r > 10, "Heavy rainfall expected: Ensure proper drainage and avoid spraying."),
+    (lambda t, h, r, w, crop: r < 1 and h < 50, "Dry conditions: Increase irrigation frequency."),
+    # Wind
+    (lambda t, h, r, w, crop: w > 20, "High winds: Secure structures and avoid aerial spraying."),
+    # Crop-specific
+    (lambda t, h, r, w, crop: crop == "wheat" and t > 30, "Wheat: High temperature may affect grain filling. Monitor closely."),
+    (lambda t, h, r, w, crop: crop == "rice" and r < 5, "Rice: Low rainfall may require additional irrigation."),
+)
+
+class TTLCache:
+    """Size-capped LRU whose entries expire ttl after they were stored"""
+    
+    def __init__(self, ttl: timedelta, capacity: int = 256):
+        self.ttl = ttl
+        self.capacity = capacity
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+    
+    def get(self, key: str) -> Any:
+        """Return the fresh value for key, or None"""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        value, stored_at = entry
+        if datetime.now() - stored_at >= self.ttl:
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+    
+    def put(self, key: str, value: Any):
+        self._entries[key] = (value, datetime.now())
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.capacity:
+            self._entries.popitem(last=False)
+    
+    def __contains__(self, key: str) -> bool:
+        return self.get(key) is not None
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
 class RealTimeDataService:
     def __init__(self):
-        self.weather_cache = {}
-        self.market_cache = {}
         self.cache_duration = timedelta(minutes=30)  # Cache for 30 minutes
+        self.weather_cache = TTLCache(self.cache_duration)
+        self.market_cache = TTLCache(self.cache_duration)
+        # Rendered advice as (data timestamp, text); a refreshed data entry carries a
+        # new timestamp, which invalidates the advice built from the old one
+        self.advice_cache = TTLCache(self.cache_duration)
+        # Last payload per request with its validators; outlives the data caches so
+        # an expired entry can be revalidated with a bodyless 304
+        self._validated_responses = TTLCache(timedelta(days=1))
+        # One pooled session for all API calls so keep-alive connections are reused
+        self._session: Optional[aiohttp.ClientSession] = None
         
         # API keys (should be in environment variables)
         self.weather_api_key = os.getenv("WEATHER_API_KEY", "")
@@ -84,15 +154,45 @@ class RealTimeDataService:
                 "Maharashtra": {"price": 6800, "change": 150, "volume": 600}
             }
         }
+        
+        # Mock records built once; the getters only stamp a fresh timestamp
+        self._mock_weather_objs: Dict[str, WeatherData] = {
+            location: WeatherData(
+                location=location,
+                temperature=data["temperature"],
+                humidity=data["humidity"],
+                rainfall=data["rainfall"],
+                wind_speed=data["wind_speed"],
+                forecast=data["forecast"],
+                timestamp=None
+            )
+            for location, data in self.mock_weather_data.items()
+        }
+        self._mock_market_objs: Dict[tuple, MarketData] = {
+            (crop, location): MarketData(
+                crop=crop,
+                location=location,
+                price=data["price"],
+                unit="quintal",
+                change=data["change"],
+                volume=data["volume"],
+                timestamp=None
+            )
+            for crop, prices in self.mock_market_data.items()
+            for location, data in prices.items()
+        }
+        # Per-crop rows for the all-locations query
+        self._market_index: Dict[str, List[MarketData]] = {}
+        for (crop, _), proto in self._mock_market_objs.items():
+            self._market_index.setdefault(crop, []).append(proto)
     
     async def get_weather_data(self, location: str) -> Optional[WeatherData]:
         """Get weather data for a location"""
         # Check cache first
         cache_key = f"weather_{location}"
-        if cache_key in self.weather_cache:
-            cached_data, timestamp = self.weather_cache[cache_key]
-            if datetime.now() - timestamp < self.cache_duration:
-                return cached_data
+        cached_data = self.weather_cache.get(cache_key)
+        if cached_data is not None:
+            return cached_data
         
         try:
             # Try real API first
@@ -103,7 +203,7 @@ class RealTimeDataService:
                 weather_data = await self._get_mock_weather(location)
             
             if weather_data:
-                self.weather_cache[cache_key] = (weather_data, datetime.now())
+                self.weather_cache.put(cache_key, weather_data)
                 return weather_data
                 
         except Exception as e:
@@ -114,10 +214,9 @@ class RealTimeDataService:
     async def get_market_data(self, crop: str, location: str = None) -> List[MarketData]:
         """Get market data for a crop"""
         cache_key = f"market_{crop}_{location or 'all'}"
-        if cache_key in self.market_cache:
-            cached_data, timestamp = self.market_cache[cache_key]
-            if datetime.now() - timestamp < self.cache_duration:
-                return cached_data
+        cached_data = self.market_cache.get(cache_key)
+        if cached_data is not None:
+            return cached_data
         
         try:
             # Try real API first
@@ -128,7 +227,7 @@ class RealTimeDataService:
                 market_data = await self._get_mock_market(crop, location)
             
             if market_data:
-                self.market_cache[cache_key] = (market_data, datetime.now())
+                self.market_cache.put(cache_key, market_data)
                 return market_data
                 
         except Exception as e:
@@ -136,34 +235,73 @@ class RealTimeDataService:
         
         return []
     
+    async def _get_session(self) -> aiohttp.ClientSession:
+        """Create the shared HTTP session on first use"""
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=100, limit_per_host=20, ttl_dns_cache=300, keepalive_timeout=60),
+                timeout=aiohttp.ClientTimeout(total=30)
+            )
+        return self._session
+    
+    async def close(self):
+        """Close the shared HTTP session"""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+    
+    async def _get_json(self, url: str, params: Dict[str, Any], key: str) -> Optional[Any]:
+        """GET a JSON document, revalidating the last copy with ETag/Last-Modified"""
+        session = await self._get_session()
+        previous = self._validated_responses.get(key)
+        headers = {}
+        if previous is not None:
+            _, etag, last_modified = previous
+            if etag:
+                headers["If-None-Match"] = etag
+            if last_modified:
+                headers["If-Modified-Since"] = last_modified
+        
+        async with session.get(url, params=params, headers=headers) as response:
+            if response.status == 304 and previous is not None:
+                # Unchanged upstream: no body was sent, reuse the stored payload
+                self._validated_responses.put(key, previous)
+                return previous[0]
+            if response.status != 200:
+                return None
+            data = _loads(await response.read())
+            etag = response.headers.get("ETag")
+            last_modified = response.headers.get("Last-Modified")
+            if etag or last_modified:
+                self._validated_responses.put(key, (data, etag, last_modified))
+            return data
+    
     async def _fetch_weather_api(self, location: str) -> Optional[WeatherData]:
         """Fetch weather data from external API"""
         # This is a placeholder for real weather API integration
         # You would integrate with OpenWeatherMap, WeatherAPI, etc.
-        async with aiohttp.ClientSession() as session:
-            # Example API call (replace with actual weather API)
-            url = f"https://api.weatherapi.com/v1/current.json"
-            params = {
-                "key": self.weather_api_key,
-                "q": location,
-                "aqi": "no"
-            }
-            
-            try:
-                async with session.get(url, params=params) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        return WeatherData(
-                            location=location,
-                            temperature=data["current"]["temp_c"],
-                            humidity=data["current"]["humidity"],
-                            rainfall=data["current"].get("precip_mm", 0),
-                            wind_speed=data["current"]["wind_kph"],
-                            forecast=[],  # Would need separate forecast API call
-                            timestamp=datetime.now()
-                        )
-            except Exception as e:
-                logger.error(f"Weather API error: {e}")
+        # Example API call (replace with actual weather API)
+        url = f"https://api.weatherapi.com/v1/current.json"
+        params = {
+            "key": self.weather_api_key,
+            "q": location,
+            "aqi": "no"
+        }
+        
+        try:
+            data = await self._get_json(url, params, f"weather_{location}")
+            if data is not None:
+                return WeatherData(
+                    location=location,
+                    temperature=data["current"]["temp_c"],
+                    humidity=data["current"]["humidity"],
+                    rainfall=data["current"].get("precip_mm", 0),
+                    wind_speed=data["current"]["wind_kph"],
+                    forecast=[],  # Would need separate forecast API call
+                    timestamp=datetime.now()
+                )
+        except Exception as e:
+            logger.error(f"Weather API error: {e}")
         
         return None
     
@@ -171,120 +309,108 @@ class RealTimeDataService:
         """Fetch market data from external API"""
         # This is a placeholder for real market API integration
         # You would integrate with NCDEX, MCX, or government price APIs
-        async with aiohttp.ClientSession() as session:
-            # Example API call (replace with actual market API)
-            url = "https://api.agmarknet.gov.in/api/v1/prices"
-            params = {
-                "api_key": self.market_api_key,
-                "commodity": crop,
-                "state": location or "all"
-            }
-            
-            try:
-                async with session.get(url, params=params) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        market_data = []
-                        for item in data.get("prices", []):
-                            market_data.append(MarketData(
-                                crop=crop,
-                                location=item["state"],
-                                price=float(item["price"]),
-                                unit=item["unit"],
-                                change=float(item.get("change", 0)),
-                                volume=float(item.get("volume", 0)),
-                                timestamp=datetime.now()
-                            ))
-                        return market_data
-            except Exception as e:
-                logger.error(f"Market API error: {e}")
+        # Example API call (replace with actual market API)
+        url = "https://api.agmarknet.gov.in/api/v1/prices"
+        params = {
+            "api_key": self.market_api_key,
+            "commodity": crop,
+            "state": location or "all"
+        }
+        
+        try:
+            data = await self._get_json(url, params, f"market_{crop}_{location or 'all'}")
+            if data is not None:
+                now = datetime.now()
+                return [
+                    MarketData(
+                        crop=crop,
+                        location=item["state"],
+                        price=float(item["price"]),
+                        unit=item["unit"],
+                        change=float(item.get("change", 0)),
+                        volume=float(item.get("volume", 0)),
+                        timestamp=now
+                    )
+                    for item in data.get("prices", ())
+                ]
+        except Exception as e:
+            logger.error(f"Market API error: {e}")
         
         return []
     
     async def _get_mock_weather(self, location: str) -> Optional[WeatherData]:
         """Get mock weather data for development"""
-        if location in self.mock_weather_data:
-            data = self.mock_weather_data[location]
-            return WeatherData(
-                location=location,
-                temperature=data["temperature"],
-                humidity=data["humidity"],
-                rainfall=data["rainfall"],
-                wind_speed=data["wind_speed"],
-                forecast=data["forecast"],
-                timestamp=datetime.now()
-            )
+        proto = self._mock_weather_objs.get(location)
+        if proto is not None:
+            return replace(proto, timestamp=datetime.now())
         return None
     
     async def _get_mock_market(self, crop: str, location: str = None) -> List[MarketData]:
         """Get mock market data for development"""
-        market_data = []
-        
-        if crop in self.mock_market_data:
-            locations = [location] if location else self.mock_market_data[crop].keys()
-            
-            for loc in locations:
-                if loc in self.mock_market_data[crop]:
-                    data = self.mock_market_data[crop][loc]
-                    market_data.append(MarketData(
-                        crop=crop,
-                        location=loc,
-                        price=data["price"],
-                        unit="quintal",
-                        change=data["change"],
-                        volume=data["volume"],
-                        timestamp=datetime.now()
-                    ))
+        if location:
+            proto = self._mock_market_objs.get((crop, location))
+            protos = [proto] if proto is not None else []
+        else:
+            protos = self._market_index.get(crop, [])
         
-        return market_data
+        # Rows from one response share a single snapshot time
+        now = datetime.now()
+        return [replace(proto, timestamp=now) for proto in protos]
     
-    def get_weather_advice(self, location: str, crop: str = None) -> str:
+    async def get_weather_advice(self, location: str, crop: str = None) -> str:
         """Generate weather-based agricultural advice"""
-        weather_data = asyncio.run(self.get_weather_data(location))
+        weather_data = await self.get_weather_data(location)
         
         if not weather_data:
             return f"Weather data not available for {location}"
         
-        advice_parts = []
-        
-        # Temperature advice
-        if weather_data.temperature > 35:
-            advice_parts.append("High temperature alert: Consider shade nets and frequent irrigation.")
-        elif weather_data.temperature < 15:
-            advice_parts.append("Low temperature: Protect crops with mulching and row covers.")
-        
-        # Rainfall advice
-        if weather_data.rainfall > 10:
-            advice_parts.append("Heavy rainfall expected: Ensure proper drainage and avoid spraying.")
-        elif weather_data.rainfall < 1 and weather_data.humidity < 50:
-            advice_parts.append("Dry conditions: Increase irrigation frequency.")
-        
-        # Wind advice
-        if weather_data.wind_speed > 20:
-            advice_parts.append("High winds: Secure structures and avoid aerial spraying.")
-        
-        # Crop-specific advice
-        if crop:
-            if crop.lower() == "wheat" and weather_data.temperature > 30:
-                advice_parts.append("Wheat: High temperature may affect grain filling. Monitor closely.")
-            elif crop.lower() == "rice" and weather_data.rainfall < 5:
-                advice_parts.append("Rice: Low rainfall may require additional irrigation.")
-        
-        if not advice_parts:
-            advice_parts.append("Weather conditions are favorable for agricultural activities.")
-        
-        return " ".join(advice_parts)
+        return self._cached_weather_advice(weather_data, location, crop)
+    
+    def _memoized_advice(self, key: tuple, stamp: datetime, build) -> str:
+        """Return advice cached under key while it was built from data stamped stamp"""
+        cached = self.advice_cache.get(key)
+        if cached is not None and cached[0] == stamp:
+            return cached[1]
+        advice = build()
+        self.advice_cache.put(key, (stamp, advice))
+        return advice
     
-    def get_market_advice(self, crop: str, location: str = None) -> str:
+    def _cached_weather_advice(self, weather_data: WeatherData, location: str, crop: str = None) -> str:
+        return self._memoized_advice(
+            ("weather", location, crop),
+            weather_data.timestamp,
+            lambda: self._weather_advice(weather_data, crop)
+        )
+    
+    def _cached_market_advice(self, market_data: List[MarketData], crop: str, location: str = None) -> str:
+        return self._memoized_advice(
+            ("market", crop, location),
+            market_data[0].timestamp,
+            lambda: self._market_advice(market_data, crop, location)
+        )
+    
+    def _weather_advice(self, weather_data: WeatherData, crop: str = None) -> str:
+        t = weather_data.temperature
+        h = weather_data.humidity
+        r = weather_data.rainfall
+        w = weather_data.wind_speed
+        crop = crop.lower() if crop else None
+        advice = " ".join(msg for applies, msg in WEATHER_ADVICE_RULES if applies(t, h, r, w, crop))
+        return advice or "Weather conditions are favorable for agricultural activities."
+    
+    async def get_market_advice(self, crop: str, location: str = None) -> str:
         """Generate market-based agricultural advice"""
-        market_data = asyncio.run(self.get_market_data(crop, location))
+        market_data = await self.get_market_data(crop, location)
         
         if not market_data:
             return f"Market data not available for {crop}"
         
-        # Analyze price trends
-        avg_price = sum(d.price for d in market_data) / len(market_data)
-        avg_change = sum(d.change for d in market_data) / len(market_data)
+        return self._cached_market_advice(market_data, crop, location)
+    
+    def _market_advice(self, market_data: List[MarketData], crop: str, location: str = None) -> str:
+        # Analyze price trends; vectorized since a real feed can return thousands of mandi rows
+        avg_price = float(market_array(market_data, "price").mean())
+        avg_change = float(market_array(market_data, "change").mean())
         
         advice_parts = []
         
@@ -302,25 +428,42 @@ class RealTimeDataService:
             advice_parts.append("Prices are below average - consider holding if storage is available.")
         
         # Location-specific advice
-        if location and any(d.location == location for d in market_data):
-            loc_data = next(d for d in market_data if d.location == location)
+        loc_data = next((d for d in market_data if d.location == location), None) if location else None
+        if loc_data is not None:
             advice_parts.append(f"In {location}: ₹{loc_data.price}/quintal (change: ₹{loc_data.change})")
         
         return " ".join(advice_parts)
     
+    async def get_relevant_insights(self, location: str = None, crop: str = None) -> List[str]:
+        """Weather and market advice for a query's location/crop, fetched concurrently"""
+        weather_data, market_data = await asyncio.gather(
+            self.get_weather_data(location) if location else asyncio.sleep(0),
+            self.get_market_data(crop, location) if crop else asyncio.sleep(0),
+        )
+        insights = []
+        if weather_data:
+            insights.append(self._cached_weather_advice(weather_data, location, crop))
+        if market_data:
+            insights.append(self._cached_market_advice(market_data, crop, location))
+        return insights
+    
     async def update_cache(self):
         """Update all cached data"""
         logger.info("Updating real-time data cache...")
         
-        # Update weather cache for common locations
+        # Refresh weather for common locations and markets for common crops concurrently
         common_locations = ["Punjab", "Maharashtra", "Karnataka", "Tamil Nadu"]
-        for location in common_locations:
-            await self.get_weather_data(location)
-        
-        # Update market cache for common crops
         common_crops = ["wheat", "rice", "cotton", "sugarcane"]
-        for crop in common_crops:
-            await self.get_market_data(crop)
+        weather_tasks = [self.get_weather_data(location) for location in common_locations]
+        market_tasks = [self.get_market_data(crop) for crop in common_crops]
+        
+        try:
+            # One slow endpoint should not stall the whole refresh
+            async with asyncio.timeout(30):
+                await asyncio.gather(*weather_tasks, *market_tasks, return_exceptions=True)
+        except TimeoutError:
+            logger.warning("Cache update timed out; some entries were not refreshed")
+            return
         
         logger.info("Cache update completed")
 
@@ -1,20 +1,37 @@
 import os
+import threading
 from typing import Optional
 
 _cached_client = None
+_client_lock = threading.Lock()
 
 def get_redis():
     global _cached_client
     if _cached_client is not None:
         return _cached_client
-    try:
-        import redis  # type: ignore
-        url = os.getenv("REDIS_URL", "redis://localhost:6379")
-        _cached_client = redis.Redis.from_url(url, decode_responses=True)
-        # Ping to verify connectivity
-        _cached_client.ping()
-        return _cached_client
-    except Exception:
-        return None
-
-
+    with _client_lock:
+        if _cached_client is not None:
+            return _cached_client
+        try:
+            import redis  # type: ignore
+            url = os.getenv("REDIS_URL", "redis://localhost:6379")
+            # Pooled connections are health-checked and re-established when dropped,
+            # so the cached client survives a Redis restart
+            pool = redis.BlockingConnectionPool.from_url(
+                url,
+                max_connections=int(os.getenv("REDIS_MAX_CONNECTIONS", "32")),
+                timeout=5,
+                decode_responses=True,
+                health_check_interval=30,
+                socket_keepalive=True,
+            )
+            client = redis.Redis(connection_pool=pool)
+            # Ping to verify connectivity, retrying once for a stale first connection
+            try:
+                client.ping()
+            except redis.ConnectionError:
+                client.ping()
+            _cached_client = client
+            return _cached_client
+        except Exception:
+            return None
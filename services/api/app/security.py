@@ -3,6 +3,8 @@ Security and rate limiting for the API
 """
 
 import time
+import hmac
+import heapq
 import hashlib
 from typing import Dict, Optional
 from fastapi import Request, HTTPException
@@ -30,6 +32,9 @@ RATE_LIMITS = {
     "cache": "20/minute"       # 20 cache operations per minute per IP
 }
 
+# Failed authentication attempts are forgotten, and blocks lifted, after 15 minutes
+FAILED_ATTEMPT_WINDOW = 900
+
 # Initialize rate limiter
 if Limiter:
     limiter = Limiter(key_func=get_remote_address)
@@ -41,11 +46,17 @@ class SecurityManager:
     
     def __init__(self):
         self.api_keys = self._load_api_keys()
-        self.blocked_ips = set()
+        self.blocked_ips = {}  # IP -> unblock_at
         self.failed_attempts = {}  # IP -> (count, last_attempt_time)
+        # Min-heap of (expires_at, ip) so sweeps only touch entries that are due
+        self._expiry_heap: list[tuple[float, str]] = []
         
+    @staticmethod
+    def _hash_api_key(api_key: str) -> str:
+        return hashlib.sha256(api_key.encode("utf-8")).hexdigest()
+    
     def _load_api_keys(self) -> Dict[str, Dict[str, str]]:
-        """Load API keys from environment or config"""
+        """Load API keys from environment or config, keyed by SHA-256 digest"""
         # In production, load from secure storage
         # For now, using environment variables
         import os
@@ -55,7 +66,7 @@ class SecurityManager:
         # Admin key for internal services
         admin_key = os.getenv("ADMIN_API_KEY")
         if admin_key:
-            api_keys[admin_key] = {
+            api_keys[self._hash_api_key(admin_key)] = {
                 "name": "admin",
                 "permissions": ["read", "write", "admin"],
                 "rate_limit_multiplier": 10
@@ -64,7 +75,7 @@ class SecurityManager:
         # Public key for mobile clients (with restrictions)
         public_key = os.getenv("PUBLIC_API_KEY")
         if public_key:
-            api_keys[public_key] = {
+            api_keys[self._hash_api_key(public_key)] = {
                 "name": "public",
                 "permissions": ["read"],
                 "rate_limit_multiplier": 1
@@ -74,7 +85,15 @@ class SecurityManager:
     
     def authenticate_api_key(self, api_key: str) -> Optional[Dict[str, str]]:
         """Authenticate API key and return user info"""
-        return self.api_keys.get(api_key)
+        if not api_key:
+            return None
+        candidate = self._hash_api_key(api_key)
+        # Compare against every known digest in constant time rather than a dict lookup
+        match = None
+        for known_hash, user_info in self.api_keys.items():
+            if hmac.compare_digest(known_hash, candidate):
+                match = user_info
+        return match
     
     def check_permissions(self, user_info: Dict[str, str], required_permission: str) -> bool:
         """Check if user has required permission"""
@@ -86,10 +105,14 @@ class SecurityManager:
     
     def is_ip_blocked(self, ip: str) -> bool:
         """Check if IP is blocked"""
+        # Only touches entries that are due, so sweeping on every check is cheap
+        self.clean_failed_attempts()
         return ip in self.blocked_ips
     
     def record_failed_attempt(self, ip: str):
         """Record failed authentication attempt"""
+        # Sweep first so attempts from IPs that never get blocked don't pile up
+        self.clean_failed_attempts()
         current_time = time.time()
         
         if ip in self.failed_attempts:
@@ -97,26 +120,30 @@ class SecurityManager:
             self.failed_attempts[ip] = (count + 1, current_time)
         else:
             self.failed_attempts[ip] = (1, current_time)
+        expires_at = current_time + FAILED_ATTEMPT_WINDOW
+        heapq.heappush(self._expiry_heap, (expires_at, ip))
         
         # Block IP after 5 failed attempts in 15 minutes
         count, first_attempt = self.failed_attempts[ip]
-        if count >= 5 and (current_time - first_attempt) < 900:  # 15 minutes
-            self.blocked_ips.add(ip)
+        if count >= 5 and (current_time - first_attempt) < FAILED_ATTEMPT_WINDOW:
+            self.blocked_ips[ip] = expires_at
             logger.warning(f"Blocked IP {ip} after {count} failed attempts")
     
     def clean_failed_attempts(self):
-        """Clean old failed attempts (older than 15 minutes)"""
+        """Clean old failed attempts (older than 15 minutes) and lift expired blocks"""
         current_time = time.time()
-        expired_ips = []
-        
-        for ip, (count, last_attempt) in self.failed_attempts.items():
-            if (current_time - last_attempt) > 900:  # 15 minutes
-                expired_ips.append(ip)
+        heap = self._expiry_heap
         
-        for ip in expired_ips:
-            del self.failed_attempts[ip]
-            if ip in self.blocked_ips:
-                self.blocked_ips.remove(ip)
+        while heap and heap[0][0] <= current_time:
+            _, ip = heapq.heappop(heap)
+            # Entries superseded by a later attempt are skipped; that attempt
+            # pushed its own expiry
+            attempt = self.failed_attempts.get(ip)
+            if attempt and attempt[1] + FAILED_ATTEMPT_WINDOW <= current_time:
+                del self.failed_attempts[ip]
+            unblock_at = self.blocked_ips.get(ip)
+            if unblock_at is not None and unblock_at <= current_time:
+                del self.blocked_ips[ip]
 
 # Security middleware functions
 def get_client_ip(request: Request) -> str:
@@ -124,7 +151,8 @@ def get_client_ip(request: Request) -> str:
     # Check for forwarded headers (when behind proxy)
     forwarded_for = request.headers.get("X-Forwarded-For")
     if forwarded_for:
-        return forwarded_for.split(",")[0].strip()
+        head, _, _ = forwarded_for.partition(",")
+        return head.strip()
     
     real_ip = request.headers.get("X-Real-IP")
     if real_ip:
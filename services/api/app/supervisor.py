@@ -3,18 +3,36 @@ LangGraph-based Supervisor for Agentic Agri Advisor
 Orchestrates multiple specialized agents with intelligent routing and synthesis
 """
 
-from typing import Dict, List, Any, TypedDict, Annotated, Literal
+from typing import Dict, List, Any, AsyncIterator, Optional, TypedDict, Annotated
 from langgraph.graph import StateGraph, END
-from langgraph.checkpoint.memory import MemorySaver
+from langgraph.constants import Send
+from pydantic import BaseModel, Field, ValidationError
 import json
+import operator
+import os
 import asyncio
+import functools
+import hashlib
 import logging
 import re
+import statistics
+import threading
+import time
+from collections import Counter
+from collections.abc import Mapping
 from datetime import datetime
 from .conversation_context import conversation_manager
+from .intent_matcher import match_intents
 
-# Set up logging
-logging.basicConfig(level=logging.INFO)
+# orjson parses the LLM's JSON replies several times faster than the stdlib
+try:
+    import orjson
+    _loads = orjson.loads
+except ImportError:
+    orjson = None
+    _loads = json.loads
+
+# Handlers and level are configured once by the app (see monitoring.py)
 logger = logging.getLogger(__name__)
 
 # Import existing agents
@@ -23,7 +41,8 @@ try:
     from .agents.crop_agent import CropAgent
     from .agents.finance_agent import FinanceAgent
     from .agents.policy_agent import PolicyAgent
-    from .llm_client import LLMClient
+    from .llm_client import get_llm_client
+    from .llm_cache import LLMCache, MemoryBackend
 except ImportError:
     import sys
     import os
@@ -32,22 +51,236 @@ except ImportError:
     from agents.crop_agent import CropAgent
     from agents.finance_agent import FinanceAgent
     from agents.policy_agent import PolicyAgent
-    from llm_client import LLMClient
+    from llm_client import get_llm_client
+    from llm_cache import LLMCache, MemoryBackend
+
+# How long a finished workflow answer may be reused, by agent consulted; the
+# shortest TTL among the agents used applies, capped by their AGENT_CACHE_TTLS
+RESPONSE_CACHE_TTLS = {
+    "weather_agent": 3600,
+    "crop_agent": 6 * 3600,
+    "finance_agent": 3600,
+    "policy_agent": 24 * 3600,
+}
+DEFAULT_RESPONSE_CACHE_TTL = 3600
+
+# How long one agent's answer to the same query/location/crop is reused
+AGENT_CACHE_TTLS = {
+    "weather": 10 * 60,
+    "crop": 3600,
+    "finance": 30 * 60,
+    "policy": 24 * 3600,
+}
+
+# Routing confidence at or above which a single agent's own answer is returned
+# without the validation LLM round-trip
+SKIP_VALIDATION_CONFIDENCE = 0.85
+
+# Queries with at least this many distinct keywords for exactly one agent go straight
+# to that agent, bypassing the LLM analysis and the workflow graph
+FAST_PATH_MIN_KEYWORD_HITS = 2
+
+# Answers at or above this confidence skip the validation LLM call unless they
+# touch one of the safety-sensitive topics below; _should_validate applies both thresholds
+TRUSTED_ANSWER_CONFIDENCE = 0.8
+RISK_PATTERN = re.compile(
+    r"\b(pesticides?|insecticides?|herbicides?|fungicides?|weedicides?|dos(?:e|es|age)|"
+    r"ml\s*(?:/|per)\s*(?:l|litre|liter)|g\s*(?:/|per)\s*(?:l|litre|liter)|"
+    r"poison\w*|toxic\w*|medicines?|medications?|antibiotics?)\b",
+    re.IGNORECASE
+)
+
+# Separates the streamed answer text from the JSON trailer in process_query_stream
+STREAM_TRAILER_SEPARATOR = "\x1e"
+
+# Prompt templates. The instructions form a byte-identical prefix on every call so
+# the provider's implicit prompt caching can reuse it; per-request content is
+# always appended last.
+ANALYSIS_PROMPT = """You are an expert agricultural advisor analyst. Analyze the farmer's query below and determine the intent, urgency, and which specialized agents should handle it.
+
+AVAILABLE AGENTS:
+1. WEATHER AGENT - Weather forecasts, climate conditions, rainfall, drought, temperature, irrigation timing, seasonal planning
+2. CROP AGENT - Crop selection, varieties, planting, cultivation, fertilizers, pest control, diseases, farming techniques, soil management
+3. FINANCE AGENT - Market prices, costs, profits, loans, banking, investments, ROI calculations, financial optimization, farm economics, spending analysis
+4. POLICY AGENT - Government schemes, subsidies, eligibility, applications, PM-Kisan, insurance, policies, regulatory compliance
+
+ANALYSIS INSTRUCTIONS:
+- Understand the INTENT behind the query, not just keywords
+- Consider the farmer's actual need and desired outcome
+- Determine urgency level: low, medium, high, urgent
+- Select 1-2 most relevant agents (usually just 1)
+- Focus on what the farmer really wants to achieve
+
+RESPOND WITH EXACTLY THIS JSON FORMAT:
+{
+    "intent": "financial_optimization",
+    "urgency": "medium",
+    "required_agents": ["finance"],
+    "needs_realtime": false,
+    "constraints": "Requires farm financial data",
+    "confidence": 0.9,
+    "reasoning": "Farmer is seeking financial advice to optimize farm costs and improve profitability",
+    "primary_goal": "Cost optimization and financial improvement"
+}
+"""
+
+GENERAL_ANSWER_PROMPT = """No specific agent responses were available. Provide a helpful, general agricultural advice response to the farmer's question below.
+"""
+
+SINGLE_AGENT_SYNTHESIS_PROMPT = """Based on the agent response below, provide a helpful answer to the farmer's question.
+"""
+
+SYNTHESIS_PROMPT = """Synthesize the agent responses below into a coherent, helpful answer.
+
+Create a comprehensive answer that:
+1. Addresses the user's query directly
+2. Combines insights from all relevant agents
+3. Prioritizes the most relevant information
+4. Provides actionable advice
+5. Maintains a natural, conversational tone
+
+Format the response as a clear, structured answer.
+"""
+
+VALIDATION_PROMPT = """Validate the agricultural advice response below.
+
+Check for:
+1. Relevance to the query
+2. Safety of recommendations
+3. Completeness of information
+4. Appropriate confidence level
+
+Respond with JSON:
+{
+    "is_valid": true/false,
+    "issues": ["list of issues if any"],
+    "suggested_improvements": ["list of improvements"],
+    "final_confidence": 0.0-1.0
+}
+"""
+
+IMPROVEMENT_PROMPT = """Improve the agricultural advice response below. Provide an improved, safer, and more relevant response.
+"""
+
+
+def _normalize_query(query: str) -> str:
+    """Lowercase and collapse whitespace once; cache keys and keyword matching share it"""
+    return " ".join(query.lower().split())
+
+
+def _keep_first_error(current: str, new: str) -> str:
+    return current or new
 
 
-class AgentState(TypedDict):
-    """State for the agent workflow"""
+def _evidence_key(item: Dict[str, Any]) -> bytes:
+    """Digest of an evidence item that ignores key order"""
+    if orjson is not None:
+        payload = orjson.dumps(item, option=orjson.OPT_SORT_KEYS, default=str)
+    else:
+        payload = json.dumps(item, sort_keys=True, default=str).encode("utf-8")
+    return hashlib.blake2b(payload, digest_size=16).digest()
+
+
+def _merge_evidence(current: List[Dict[str, Any]], new: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Append evidence from another agent branch, dropping items already cited"""
+    seen = {_evidence_key(item) for item in current}
+    merged = list(current)
+    for item in new:
+        key = _evidence_key(item)
+        if key not in seen:
+            seen.add(key)
+            merged.append(item)
+    return merged
+
+
+class QueryAnalysis(BaseModel):
+    """Expected shape of the analysis LLM reply"""
+    intent: str = "general"
+    urgency: str = "medium"
+    required_agents: List[str] = []
+    needs_realtime: bool = False
+    constraints: str = ""
+    confidence: float = Field(0.7, ge=0.0, le=1.0)
+    reasoning: str = ""
+    primary_goal: str = ""
+
+
+class ResponseValidation(BaseModel):
+    """Expected shape of the validation LLM reply"""
+    is_valid: bool = True
+    issues: List[str] = []
+    suggested_improvements: List[str] = []
+    final_confidence: Optional[float] = Field(None, ge=0.0, le=1.0)
+
+
+class AgentState(TypedDict, total=False):
+    """State for the agent workflow; nodes return only the keys they change"""
     query: str
+    # _normalize_query(query), computed once per request
+    query_key: str
     location: str
     crop: str
+    # Agents the fast path already ran; their responses seed agent_responses
+    prefetched_agents: List[str]
     user_context: Dict[str, Any]
-    agent_decisions: List[Dict[str, Any]]
-    agent_responses: List[Dict[str, Any]]
+    # Agents run as parallel branches; each contributes its response and evidence
+    # through the reducers
+    agent_responses: Annotated[List[Dict[str, Any]], operator.add]
     final_answer: str
-    evidence: List[Dict[str, Any]]
+    evidence: Annotated[List[Dict[str, Any]], _merge_evidence]
     confidence: float
     workflow_step: str
-    error: str
+    error: Annotated[str, _keep_first_error]
+
+
+class AgentTask(TypedDict):
+    """Input for one fanned-out agent execution"""
+    agent: str
+    query: str
+    query_key: str
+    location: str
+    crop: str
+    # Skip the agent response cache when the query asks for live data
+    realtime: bool
+
+
+AGENT_CLASSES = {
+    "weather": WeatherAgent,
+    "crop": CropAgent,
+    "finance": FinanceAgent,
+    "policy": PolicyAgent,
+}
+
+
+class LazyAgents(Mapping):
+    """Agent registry that constructs each agent on first use"""
+    
+    def __init__(self, factories: Dict[str, Any]):
+        self._factories = factories
+        self._instances: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+    
+    def __getitem__(self, name: str):
+        agent = self._instances.get(name)
+        if agent is None:
+            factory = self._factories[name]
+            # Fanned-out branches may ask for the same agent from several threads
+            with self._lock:
+                agent = self._instances.get(name)
+                if agent is None:
+                    logger.debug("🔧 Loading %s agent", name)
+                    agent = self._instances[name] = factory()
+        return agent
+    
+    def __contains__(self, name) -> bool:
+        # Membership must not construct the agent (Mapping's default calls __getitem__)
+        return name in self._factories
+    
+    def __iter__(self):
+        return iter(self._factories)
+    
+    def __len__(self):
+        return len(self._factories)
 
 
 class SupervisorAgent:
@@ -55,89 +288,124 @@ class SupervisorAgent:
     
     def __init__(self):
         logger.info("🔧 Initializing SupervisorAgent...")
-        self.agents = {
-            "weather": WeatherAgent(),
-            "crop": CropAgent(),
-            "finance": FinanceAgent(),
-            "policy": PolicyAgent()
-        }
-        logger.info(f"✅ Loaded {len(self.agents)} agents: {list(self.agents.keys())}")
-        self.llm_client = LLMClient()
-        logger.info("🔧 Building LangGraph workflow...")
+        self.agents = LazyAgents(AGENT_CLASSES)
+        logger.info("✅ Registered %s agents: %s", len(self.agents), list(self.agents))
+        self.llm_client = get_llm_client()
+        # Finished workflow answers, matched exactly or by query similarity within
+        # the same location/crop
+        self.response_cache = LLMCache(
+            backends=[MemoryBackend(int(os.getenv("SUPERVISOR_CACHE_SIZE", "1024")))],
+            embedder=self._embed_for_cache,
+            similarity_threshold=float(os.getenv("LLM_CACHE_SIMILARITY", "0.92"))
+        )
+        # Smoothed wall time of each agent's process_query, used to start the slowest first
+        self._agent_latency_ema: Dict[str, float] = {}
+        # Individual agent answers, shared by workflows that consult the same agent
+        self.agent_cache = MemoryBackend(int(os.getenv("AGENT_CACHE_SIZE", "2048")))
+        # Query analysis depends only on the prompt inputs; repeat queries skip the LLM call
+        self._llm_analyze = functools.lru_cache(maxsize=4096)(self._llm_analyze_uncached)
+        logger.debug("🔧 Building LangGraph workflow...")
         self.graph = self._build_workflow()
+        self.agents_graph = self._build_workflow(synthesize=False)
         logger.info("✅ SupervisorAgent initialization complete")
     
-    def _build_workflow(self) -> StateGraph:
-        """Build the LangGraph workflow"""
-        logger.info("🔧 Building LangGraph workflow...")
+    def _embed_for_cache(self, text: str):
+        """Reuse the query embedder the API registers on the LLM cache"""
+        embedder = self.llm_client.cache.embedder
+        if embedder is None:
+            raise RuntimeError("No query embedder registered")
+        return embedder(text)
+    
+    def _response_cache_keys(self, query_key: str, location: str, crop: str) -> tuple[str, str]:
+        scope = LLMCache.make_key(kind="supervisor", location=(location or "").lower(), crop=(crop or "").lower())
+        key = LLMCache.make_key(scope=scope, query=query_key)
+        return key, scope
+    
+    async def _cached_result(self, query: str, cache_key: str, cache_scope: str) -> Optional[Dict[str, Any]]:
+        """Replay a cached supervisor result, or None on a miss"""
+        # A miss falls through to a semantic lookup that embeds the query; keep that
+        # model call off the event loop
+        cached = await asyncio.to_thread(self.response_cache.get, cache_key, query, cache_scope)
+        if cached is None:
+            return None
+        logger.debug("⚡ SUPERVISOR CACHE HIT")
+        return json.loads(cached)
+    
+    @staticmethod
+    def _response_cache_ttl(agents_consulted: List[str]) -> int:
+        """Shortest TTL among the consulted agents, so a whole answer never outlives an agent's"""
+        return min(
+            (
+                min(
+                    RESPONSE_CACHE_TTLS.get(agent, DEFAULT_RESPONSE_CACHE_TTL),
+                    AGENT_CACHE_TTLS.get(agent.removesuffix("_agent"), DEFAULT_RESPONSE_CACHE_TTL)
+                )
+                for agent in agents_consulted if agent
+            ),
+            default=DEFAULT_RESPONSE_CACHE_TTL
+        )
+    
+    def _build_workflow(self, synthesize: bool = True) -> StateGraph:
+        """Build the LangGraph workflow; without synthesis it stops once the agents have answered"""
+        logger.debug("🔧 Building LangGraph workflow...")
         
         # Create the state graph
         workflow = StateGraph(AgentState)
         
         # Add nodes
         workflow.add_node("analyze_query", self._analyze_query)
-        workflow.add_node("route_to_agents", self._route_to_agents)
-        workflow.add_node("execute_weather_agent", self._execute_weather_agent)
-        workflow.add_node("execute_crop_agent", self._execute_crop_agent)
-        workflow.add_node("execute_finance_agent", self._execute_finance_agent)
-        workflow.add_node("execute_policy_agent", self._execute_policy_agent)
-        workflow.add_node("synthesize_response", self._synthesize_response)
-        workflow.add_node("validate_response", self._validate_response)
+        workflow.add_node("execute_agent", self._execute_agent)
         
         # Define the workflow
         workflow.set_entry_point("analyze_query")
         
-        # Add conditional edges
+        if not synthesize:
+            # Streaming callers synthesize the answer themselves
+            workflow.add_conditional_edges(
+                "analyze_query",
+                self._route_to_agents,
+                {"execute_agent": "execute_agent", "synthesize_response": END, END: END}
+            )
+            workflow.add_edge("execute_agent", END)
+            return workflow.compile()
+        
+        workflow.add_node("synthesize_response", self._synthesize_response)
+        workflow.add_node("validate_response", self._validate_response)
+        
+        # Fan out to every required agent at once; the branches join at synthesis
         workflow.add_conditional_edges(
             "analyze_query",
-            self._should_route_to_agents,
-            {
-                "route": "route_to_agents",
-                "direct_answer": "synthesize_response",
-                "error": END
-            }
+            self._route_to_agents,
+            ["execute_agent", "synthesize_response", END]
         )
+        workflow.add_edge("execute_agent", "synthesize_response")
         
+        # Final synthesis and validation
         workflow.add_conditional_edges(
-            "route_to_agents",
-            self._determine_agent_execution,
-            {
-                "weather": "execute_weather_agent",
-                "crop": "execute_crop_agent", 
-                "finance": "execute_finance_agent",
-                "policy": "execute_policy_agent",
-                "multiple": "execute_weather_agent",  # Start with weather, then others
-                "synthesize": "synthesize_response"
-            }
+            "synthesize_response",
+            self._should_validate,
+            {"validate": "validate_response", "skip": END}
         )
-        
-        # Add edges from agent executions back to routing
-        workflow.add_edge("execute_weather_agent", "route_to_agents")
-        workflow.add_edge("execute_crop_agent", "route_to_agents")
-        workflow.add_edge("execute_finance_agent", "route_to_agents")
-        workflow.add_edge("execute_policy_agent", "route_to_agents")
-        
-        # Final synthesis and validation
-        workflow.add_edge("synthesize_response", "validate_response")
         workflow.add_edge("validate_response", END)
         
-        compiled_workflow = workflow.compile(checkpointer=MemorySaver())
+        # No checkpointer: every run is a one-off thread that is never resumed, and a
+        # MemorySaver would keep every request's state for the life of the process
+        compiled_workflow = workflow.compile()
         logger.info("✅ LangGraph workflow built and compiled successfully")
         return compiled_workflow
     
-    def _analyze_query(self, state: AgentState) -> AgentState:
+    def _analyze_query(self, state: AgentState) -> Dict[str, Any]:
         """Analyze the user query using pure LLM intelligence"""
-        logger.info(f"🔍 ANALYZING QUERY: '{state['query']}' | Location: {state.get('location', 'N/A')} | Crop: {state.get('crop', 'N/A')}")
+        logger.debug("🔍 ANALYZING QUERY: '%s' | Location: %s | Crop: %s", state['query'], state.get('location', 'N/A'), state.get('crop', 'N/A'))
         try:
             query = state["query"]
             location = state.get("location", "")
             crop = state.get("crop", "")
             
             # Use pure LLM analysis - no keywords, only intelligence
-            analysis = self._llm_query_analysis(query, location, crop)
+            analysis = self._llm_query_analysis(query, location, crop, query_key=state.get("query_key"))
             
-            # Update state with analysis
-            state["user_context"] = {
+            user_context = {
                 "intent": analysis.get("intent", "general"),
                 "urgency": analysis.get("urgency", "medium"),
                 "required_agents": analysis.get("required_agents", []),
@@ -148,18 +416,16 @@ class SupervisorAgent:
                 "primary_goal": analysis.get("primary_goal", "")
             }
             
-            state["workflow_step"] = "query_analyzed"
-            logger.info(f"📊 QUERY ANALYSIS RESULT: Intent={analysis.get('intent', 'general')} | Required Agents={analysis.get('required_agents', [])} | Confidence={analysis.get('confidence', 0.7)}")
+            logger.debug("📊 QUERY ANALYSIS RESULT: Intent=%s | Required Agents=%s | Confidence=%s", analysis.get('intent', 'general'), analysis.get('required_agents', []), analysis.get('confidence', 0.7))
+            return {"user_context": user_context, "workflow_step": "query_analyzed"}
             
         except Exception as e:
-            logger.error(f"❌ QUERY ANALYSIS FAILED: {str(e)}")
-            state["error"] = f"Query analysis failed: {str(e)}"
-            state["workflow_step"] = "error"
-        
-        return state
+            logger.error("❌ QUERY ANALYSIS FAILED: %s", e)
+            return {"error": f"Query analysis failed: {str(e)}", "workflow_step": "error"}
     
-    def _llm_query_analysis(self, query: str, location: str, crop: str, context_info: Dict[str, Any] = None) -> Dict[str, Any]:
+    def _llm_query_analysis(self, query: str, location: str, crop: str, context_info: Dict[str, Any] = None, query_key: Optional[str] = None) -> Dict[str, Any]:
         """Pure LLM-based query analysis - no keywords, only intelligent understanding"""
+        query_key = query_key or _normalize_query(query)
         
         # Prepare context section
         context_section = ""
@@ -172,52 +438,17 @@ CONVERSATION CONTEXT:
 - Summary: {context_info.get('conversation_summary', 'No previous context')}
 """
         
-        analysis_prompt = f"""You are an expert agricultural advisor analyst. Analyze this farmer's query and determine the intent, urgency, and which specialized agents should handle it.
-
-QUERY: "{query}"
-LOCATION: {location or "Not specified"}
-CROP: {crop or "Not specified"}
-{context_section}
-
-AVAILABLE AGENTS:
-1. WEATHER AGENT - Weather forecasts, climate conditions, rainfall, drought, temperature, irrigation timing, seasonal planning
-2. CROP AGENT - Crop selection, varieties, planting, cultivation, fertilizers, pest control, diseases, farming techniques, soil management
-3. FINANCE AGENT - Market prices, costs, profits, loans, banking, investments, ROI calculations, financial optimization, farm economics, spending analysis
-4. POLICY AGENT - Government schemes, subsidies, eligibility, applications, PM-Kisan, insurance, policies, regulatory compliance
-
-ANALYSIS INSTRUCTIONS:
-- Understand the INTENT behind the query, not just keywords
-- Consider the farmer's actual need and desired outcome
-- Determine urgency level: low, medium, high, urgent
-- Select 1-2 most relevant agents (usually just 1)
-- Focus on what the farmer really wants to achieve
-
-RESPOND WITH EXACTLY THIS JSON FORMAT:
-{{
-    "intent": "financial_optimization",
-    "urgency": "medium", 
-    "required_agents": ["finance"],
-    "needs_realtime": false,
-    "constraints": "Requires farm financial data",
-    "confidence": 0.9,
-    "reasoning": "Farmer is seeking financial advice to optimize farm costs and improve profitability",
-    "primary_goal": "Cost optimization and financial improvement"
-}}"""
-
         try:
-            logger.info("🧠 QUERYING LLM FOR INTELLIGENT QUERY ANALYSIS...")
-            llm_response = self.llm_client.generate_text(analysis_prompt)
-            
-            # Clean and parse JSON response
-            cleaned_json = self._clean_json_response(llm_response)
-            analysis_result = json.loads(cleaned_json)
-            
-            logger.info(f"🧠 LLM ANALYSIS: Intent='{analysis_result.get('intent')}' | Agents={analysis_result.get('required_agents')} | Confidence={analysis_result.get('confidence')}")
-            
-            return analysis_result
-            
+            return dict(self._llm_analyze(query_key, location or "", crop or "", context_section))
         except Exception as e:
-            logger.error(f"❌ LLM QUERY ANALYSIS FAILED: {str(e)}")
+            logger.error("❌ LLM QUERY ANALYSIS FAILED: %s", e)
+            return self._fallback_query_analysis(query_key)
+    
+    def _fallback_query_analysis(self, query_key: str) -> Dict[str, Any]:
+        """Keyword-based routing for when the LLM analysis is unavailable; takes the normalized query"""
+        # Repeating a keyword ("rain ... rainy") adds no confidence; count distinct keywords
+        hits = Counter(tag for tag, _ in set(match_intents(query_key)))
+        if not hits:
             # Emergency fallback - route to crop agent with low confidence
             return {
                 "intent": "general_agricultural",
@@ -229,387 +460,284 @@ RESPOND WITH EXACTLY THIS JSON FORMAT:
                 "reasoning": "Fallback routing due to LLM unavailability",
                 "primary_goal": "General agricultural assistance"
             }
+        
+        required_agents = sorted(hits)
+        return {
+            "intent": required_agents[0] if len(required_agents) == 1 else "multi_domain",
+            "urgency": "medium",
+            "required_agents": required_agents,
+            "needs_realtime": "weather" in hits,
+            "constraints": "LLM analysis unavailable",
+            "confidence": 0.5,
+            "reasoning": f"Keyword routing due to LLM unavailability ({dict(hits)})",
+            "primary_goal": "General agricultural assistance",
+            "keyword_hits": dict(hits)
+        }
     
-    def _should_route_to_agents(self, state: AgentState) -> Literal["route", "direct_answer", "error"]:
-        """Determine if we should route to agents or provide direct answer"""
-        if state.get("error"):
-            logger.warning("⚠️ ROUTING DECISION: Error detected, ending workflow")
-            return "error"
+    def _llm_analyze_uncached(self, query: str, location: str, crop: str, context_section: str) -> Dict[str, Any]:
+        """Run the analysis prompt; raises on failure so fallbacks are never cached"""
+        analysis_prompt = (
+            f"{ANALYSIS_PROMPT}\n"
+            f"QUERY: \"{query}\"\n"
+            f"LOCATION: {location or 'Not specified'}\n"
+            f"CROP: {crop or 'Not specified'}\n"
+            f"{context_section}"
+        )
+
+        logger.debug("🧠 QUERYING LLM FOR INTELLIGENT QUERY ANALYSIS...")
+        llm_response = self.llm_client.generate_text(analysis_prompt)
         
-        context = state.get("user_context", {})
-        required_agents = context.get("required_agents", [])
+        # Clean, parse and schema-check the reply; malformed output raises here and
+        # falls back to keyword routing
+        cleaned_json = self._clean_json_response(llm_response)
+        analysis_result = QueryAnalysis.model_validate(_loads(cleaned_json)).model_dump()
         
-        if not required_agents:
-            logger.info("🔄 ROUTING DECISION: No agents required, going to direct answer")
-            return "direct_answer"
+        logger.debug("🧠 LLM ANALYSIS: Intent='%s' | Agents=%s | Confidence=%s", analysis_result['intent'], analysis_result['required_agents'], analysis_result['confidence'])
         
-        logger.info(f"🔄 ROUTING DECISION: Routing to {len(required_agents)} agents: {required_agents}")
-        return "route"
+        return analysis_result
     
-    def _route_to_agents(self, state: AgentState) -> AgentState:
-        """Route the query to appropriate agents"""
-        logger.info("🔄 ROUTING TO AGENTS...")
-        try:
-            context = state.get("user_context", {})
-            required_agents = context.get("required_agents", [])
-            executed_agents = [resp.get("agent") for resp in state.get("agent_responses", [])]
-            
-            logger.info(f"📋 AGENT STATUS: Required={required_agents} | Executed={executed_agents}")
-            
-            # Determine which agents still need to be executed
-            # The agent responses contain 'agent' field with values like 'weather_agent', 'policy_agent'
-            # We need to match against the base agent names
-            executed_agent_names = []
-            for resp in state.get("agent_responses", []):
-                agent_name = resp.get("agent", "")
-                if agent_name.endswith("_agent"):
-                    executed_agent_names.append(agent_name[:-6])  # Remove '_agent' suffix
-                else:
-                    executed_agent_names.append(agent_name)
-            
-            pending_agents = [agent for agent in required_agents if agent not in executed_agent_names]
-            logger.info(f"⏳ PENDING AGENTS: {pending_agents}")
-            
-            if not pending_agents:
-                # All agents have been executed, move to synthesis
-                logger.info("✅ ALL AGENTS EXECUTED: Moving to synthesis")
-                state["workflow_step"] = "all_agents_executed"
-                return state
-            
-            # Decide which agent to execute next
-            if "weather" in pending_agents:
-                logger.info("🌤️ NEXT AGENT: Weather agent")
-                state["workflow_step"] = "executing_weather"
-                return state
-            elif "crop" in pending_agents:
-                logger.info("🌱 NEXT AGENT: Crop agent")
-                state["workflow_step"] = "executing_crop"
-                return state
-            elif "finance" in pending_agents:
-                logger.info("💰 NEXT AGENT: Finance agent")
-                state["workflow_step"] = "executing_finance"
-                return state
-            elif "policy" in pending_agents:
-                logger.info("📋 NEXT AGENT: Policy agent")
-                state["workflow_step"] = "executing_policy"
-                return state
-            else:
-                logger.info("🔄 NEXT STEP: Moving to synthesis")
-                state["workflow_step"] = "synthesizing"
-                return state
-                
-        except Exception as e:
-            logger.error(f"❌ AGENT ROUTING FAILED: {str(e)}")
-            state["error"] = f"Agent routing failed: {str(e)}"
-            state["workflow_step"] = "error"
+    def _route_to_agents(self, state: AgentState):
+        """Send the query to every required agent in parallel, or skip straight to synthesis"""
+        if state.get("error"):
+            logger.warning("⚠️ ROUTING DECISION: Error detected, ending workflow")
+            return END
         
-        return state
-    
-    def _determine_agent_execution(self, state: AgentState) -> Literal["weather", "crop", "finance", "policy", "multiple", "synthesize"]:
-        """Determine which agent to execute next"""
-        workflow_step = state.get("workflow_step", "")
-        logger.info(f"🎯 DETERMINING EXECUTION: Current step = '{workflow_step}'")
+        context = state.get("user_context", {})
+        prefetched = state.get("prefetched_agents", [])
+        required_agents = [
+            agent for agent in context.get("required_agents", [])
+            if agent in self.agents and agent not in prefetched
+        ]
         
-        if workflow_step == "executing_weather":
-            logger.info("🌤️ EXECUTION DECISION: Weather agent")
-            return "weather"
-        elif workflow_step == "executing_crop":
-            logger.info("🌱 EXECUTION DECISION: Crop agent")
-            return "crop"
-        elif workflow_step == "executing_finance":
-            logger.info("💰 EXECUTION DECISION: Finance agent")
-            return "finance"
-        elif workflow_step == "executing_policy":
-            logger.info("📋 EXECUTION DECISION: Policy agent")
-            return "policy"
-        elif workflow_step == "all_agents_executed":
-            logger.info("🔄 EXECUTION DECISION: Synthesize responses")
-            return "synthesize"
-        else:
-            logger.info("🔄 EXECUTION DECISION: Default to synthesize")
-            return "synthesize"
-    
-    def _execute_weather_agent(self, state: AgentState) -> AgentState:
-        """Execute the weather agent"""
-        logger.info("🌤️ EXECUTING WEATHER AGENT...")
-        try:
-            logger.info(f"🌤️ Weather Agent Input: Query='{state['query']}' | Location='{state.get('location', 'N/A')}' | Crop='{state.get('crop', 'N/A')}'")
-            
-            response = self.agents["weather"].process_query(
-                state["query"], 
-                state.get("location"), 
-                state.get("crop")
-            )
-            
-            logger.info(f"🌤️ Weather Agent Response: {response.get('answer', 'No answer')[:100]}... | Confidence: {response.get('confidence', 0.0)}")
-            
-            agent_responses = state.get("agent_responses", [])
-            agent_responses.append(response)
-            state["agent_responses"] = agent_responses
-            
-            state["workflow_step"] = "weather_executed"
-            logger.info("✅ Weather agent execution completed")
-            
-        except Exception as e:
-            logger.error(f"❌ WEATHER AGENT FAILED: {str(e)}")
-            state["error"] = f"Weather agent failed: {str(e)}"
-            state["workflow_step"] = "error"
+        if not required_agents:
+            logger.debug("🔄 ROUTING DECISION: No agents left to run, going to direct answer")
+            return "synthesize_response"
         
-        return state
+        # Start the historically slowest agent first so it gets the most overlap
+        required_agents.sort(key=lambda agent: self._agent_latency_ema.get(agent, 0.0), reverse=True)
+        logger.debug("🔄 ROUTING DECISION: Fanning out to %s agents: %s", len(required_agents), required_agents)
+        return [
+            Send("execute_agent", AgentTask(
+                agent=agent,
+                query=state["query"],
+                query_key=state["query_key"],
+                location=state.get("location"),
+                crop=state.get("crop"),
+                realtime=context.get("needs_realtime", False)
+            ))
+            for agent in required_agents
+        ]
     
-    def _execute_crop_agent(self, state: AgentState) -> AgentState:
-        """Execute the crop agent"""
-        logger.info("🌱 EXECUTING CROP AGENT...")
-        try:
-            logger.info(f"🌱 Crop Agent Input: Query='{state['query']}' | Location='{state.get('location', 'N/A')}' | Crop='{state.get('crop', 'N/A')}'")
-            
-            response = self.agents["crop"].process_query(
-                state["query"], 
-                state.get("location"), 
-                state.get("crop")
-            )
-            
-            logger.info(f"🌱 Crop Agent Response: {response.get('answer', 'No answer')[:100]}... | Confidence: {response.get('confidence', 0.0)}")
-            
-            agent_responses = state.get("agent_responses", [])
-            agent_responses.append(response)
-            state["agent_responses"] = agent_responses
-            
-            state["workflow_step"] = "crop_executed"
-            logger.info("✅ Crop agent execution completed")
-            
-        except Exception as e:
-            logger.error(f"❌ CROP AGENT FAILED: {str(e)}")
-            state["error"] = f"Crop agent failed: {str(e)}"
-            state["workflow_step"] = "error"
+    async def _execute_agent(self, task: AgentTask) -> Dict[str, Any]:
+        """Execute one agent; runs concurrently with the other fanned-out agents"""
+        agent = task["agent"]
+        cache_key = LLMCache.make_key(
+            agent=agent,
+            query=task["query_key"],
+            location=(task.get("location") or "").lower(),
+            crop=(task.get("crop") or "").lower()
+        )
+        cached = None if task.get("realtime") else self.agent_cache.get(cache_key)
+        if cached is not None:
+            logger.debug("⚡ %s AGENT CACHE HIT", agent.upper())
+            response = json.loads(cached)
+            return {"agent_responses": [response], "evidence": response.get("evidence", [])}
         
-        return state
-    
-    def _execute_finance_agent(self, state: AgentState) -> AgentState:
-        """Execute the finance agent"""
-        logger.info("💰 EXECUTING FINANCE AGENT...")
+        logger.debug("⚡ EXECUTING %s AGENT...", agent.upper())
+        started = time.perf_counter()
         try:
-            logger.info(f"💰 Finance Agent Input: Query='{state['query']}' | Location='{state.get('location', 'N/A')}' | Crop='{state.get('crop', 'N/A')}'")
-            
-            response = self.agents["finance"].process_query(
-                state["query"], 
-                state.get("location"), 
-                state.get("crop")
+            # Agents are synchronous and I/O bound; keep them off the event loop
+            response = await asyncio.to_thread(
+                self.agents[agent].process_query,
+                task["query"],
+                task.get("location"),
+                task.get("crop")
             )
-            
-            logger.info(f"💰 Finance Agent Response: {response.get('answer', 'No answer')[:100]}... | Confidence: {response.get('confidence', 0.0)}")
-            
-            agent_responses = state.get("agent_responses", [])
-            agent_responses.append(response)
-            state["agent_responses"] = agent_responses
-            
-            state["workflow_step"] = "finance_executed"
-            logger.info("✅ Finance agent execution completed")
-            
         except Exception as e:
-            logger.error(f"❌ FINANCE AGENT FAILED: {str(e)}")
-            state["error"] = f"Finance agent failed: {str(e)}"
-            state["workflow_step"] = "error"
+            logger.error("❌ %s AGENT FAILED: %s", agent.upper(), e)
+            return {"error": f"{agent.capitalize()} agent failed: {str(e)}"}
+        finally:
+            elapsed = time.perf_counter() - started
+            previous = self._agent_latency_ema.get(agent)
+            self._agent_latency_ema[agent] = elapsed if previous is None else 0.9 * previous + 0.1 * elapsed
         
-        return state
-    
-    def _execute_policy_agent(self, state: AgentState) -> AgentState:
-        """Execute the policy agent"""
-        logger.info("📋 EXECUTING POLICY AGENT...")
-        try:
-            logger.info(f"📋 Policy Agent Input: Query='{state['query']}' | Location='{state.get('location', 'N/A')}' | Crop='{state.get('crop', 'N/A')}'")
-            
-            response = self.agents["policy"].process_query(
-                state["query"], 
-                state.get("location"), 
-                state.get("crop")
+        if self._agent_answer(response):
+            self.agent_cache.set(
+                cache_key,
+                json.dumps(response, default=str),
+                AGENT_CACHE_TTLS.get(agent, DEFAULT_RESPONSE_CACHE_TTL)
             )
-            
-            logger.info(f"📋 Policy Agent Response: {response.get('answer', 'No answer')[:100]}... | Confidence: {response.get('confidence', 0.0)}")
-            
-            agent_responses = state.get("agent_responses", [])
-            agent_responses.append(response)
-            state["agent_responses"] = agent_responses
-            
-            state["workflow_step"] = "policy_executed"
-            logger.info("✅ Policy agent execution completed")
-            
-        except Exception as e:
-            logger.error(f"❌ POLICY AGENT FAILED: {str(e)}")
-            state["error"] = f"Policy agent failed: {str(e)}"
-            state["workflow_step"] = "error"
-        
-        return state
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("✅ %s Agent Response: %s... | Confidence: %s", agent.capitalize(), response.get('answer', 'No answer')[:100], response.get('confidence', 0.0))
+        return {"agent_responses": [response], "evidence": response.get("evidence", [])}
     
-    def _synthesize_response(self, state: AgentState) -> AgentState:
+    def _synthesize_response(self, state: AgentState) -> Dict[str, Any]:
         """Synthesize responses from all agents into a coherent answer"""
-        logger.info("🔄 SYNTHESIZING RESPONSES...")
+        logger.debug("🔄 SYNTHESIZING RESPONSES...")
+        workflow_step = "synthesized"
         try:
             agent_responses = state.get("agent_responses", [])
             context = state.get("user_context", {})
-            logger.info(f"📊 SYNTHESIS INPUT: {len(agent_responses)} agent responses | Context: {context.get('intent', 'unknown')}")
+            logger.debug("📊 SYNTHESIS INPUT: %s agent responses | Context: %s", len(agent_responses), context.get('intent', 'unknown'))
             
-            if not agent_responses:
-                # No agent responses, generate a general answer
-                logger.info("⚠️ NO AGENT RESPONSES: Generating general answer")
-                synthesis_prompt = f"""
-                The user asked: {state['query']}
-                Location: {state.get('location', 'Not specified')}
-                Crop: {state.get('crop', 'Not specified')}
-                
-                No specific agent responses were available. Provide a helpful, general agricultural advice response.
-                """
-                
-                final_answer = self.llm_client.generate_text(synthesis_prompt)
-                confidence = 0.3
-                evidence = []
-                
+            # For single agent responses, try to use the agent's direct response first
+            final_answer = self._direct_agent_answer(agent_responses)
+            if final_answer is not None:
+                workflow_step = "agent_answer"
+                logger.debug("✅ USING DIRECT AGENT RESPONSE")
             else:
-                # Synthesize multiple agent responses
-                logger.info(f"🔄 SYNTHESIZING {len(agent_responses)} AGENT RESPONSES...")
-                
-                # For single agent responses, try to use the agent's direct response first
-                if len(agent_responses) == 1:
-                    single_response = agent_responses[0]
-                    # Try to get the answer from various response formats
-                    agent_answer = (
-                        single_response.get('answer') or 
-                        single_response.get('result', {}).get('advice') or
-                        single_response.get('response') or
-                        ""
-                    )
-                    
-                    if agent_answer and agent_answer != "No answer":
-                        # Use the agent's direct response if it's good
-                        final_answer = agent_answer
-                        logger.info("✅ USING DIRECT AGENT RESPONSE")
-                    else:
-                        # Fall back to LLM synthesis
-                        synthesis_prompt = f"""
-                        Based on the agent response, provide a helpful answer to: {state['query']}
-                        
-                        Agent Response: {json.dumps(single_response, indent=2)}
-                        Location: {state.get('location', 'Not specified')}
-                        Crop: {state.get('crop', 'Not specified')}
-                        """
-                        final_answer = self.llm_client.generate_text(synthesis_prompt)
-                else:
-                    # Multiple agent responses - need LLM synthesis
-                    synthesis_prompt = f"""
-                    Synthesize the following agent responses into a coherent, helpful answer:
-                    
-                    Original Query: {state['query']}
-                    Location: {state.get('location', 'Not specified')}
-                    Crop: {state.get('crop', 'Not specified')}
-                    
-                    Agent Responses:
-                    {json.dumps(agent_responses, indent=2)}
-                    
-                    Create a comprehensive answer that:
-                    1. Addresses the user's query directly
-                    2. Combines insights from all relevant agents
-                    3. Prioritizes the most relevant information
-                    4. Provides actionable advice
-                    5. Maintains a natural, conversational tone
-                    
-                    Format the response as a clear, structured answer.
-                    """
-                    
-                    final_answer = self.llm_client.generate_text(synthesis_prompt)
-                
-                # Calculate confidence based on agent responses
-                confidences = [resp.get("confidence", 0.0) for resp in agent_responses]
-                confidence = sum(confidences) / len(confidences) if confidences else 0.5
-                
-                # Collect all evidence
-                evidence = []
-                for resp in agent_responses:
-                    evidence.extend(resp.get("evidence", []))
+                logger.debug("🔄 SYNTHESIZING %s AGENT RESPONSES...", len(agent_responses))
+                final_answer = self.llm_client.generate_text(self._synthesis_prompt(state))
+            confidence = self._synthesis_confidence(agent_responses)
             
-            state["final_answer"] = final_answer
-            state["confidence"] = round(confidence, 3)
-            state["evidence"] = evidence
-            state["workflow_step"] = "synthesized"
-            logger.info(f"✅ SYNTHESIS COMPLETE: Confidence={confidence} | Evidence count={len(evidence)}")
+            # Evidence was already gathered from the agent branches by the reducer
+            logger.debug("✅ SYNTHESIS COMPLETE: Confidence=%s | Evidence count=%s", confidence, len(state.get('evidence', [])))
+            return {
+                "final_answer": final_answer,
+                "confidence": round(confidence, 3),
+                "workflow_step": workflow_step
+            }
             
         except Exception as e:
-            logger.error(f"❌ RESPONSE SYNTHESIS FAILED: {str(e)}")
-            state["error"] = f"Response synthesis failed: {str(e)}"
-            state["workflow_step"] = "error"
-        
-        return state
+            logger.error("❌ RESPONSE SYNTHESIS FAILED: %s", e)
+            return {"error": f"Response synthesis failed: {str(e)}", "workflow_step": "error"}
+    
+    def _direct_agent_answer(self, agent_responses: List[Dict[str, Any]]) -> Optional[str]:
+        """The lone agent's own answer, when it is good enough to return as is"""
+        if len(agent_responses) != 1:
+            return None
+        agent_answer = self._agent_answer(agent_responses[0])
+        if agent_answer and agent_answer != "No answer":
+            return agent_answer
+        return None
+    
+    def _synthesis_prompt(self, state: AgentState) -> str:
+        """Prompt that turns the agent responses (or none) into one answer"""
+        agent_responses = state.get("agent_responses", [])
+        if not agent_responses:
+            # No agent responses, generate a general answer
+            logger.debug("⚠️ NO AGENT RESPONSES: Generating general answer")
+            return (
+                f"{GENERAL_ANSWER_PROMPT}\n"
+                f"Query: {state['query']}\n"
+                f"Location: {state.get('location', 'Not specified')}\n"
+                f"Crop: {state.get('crop', 'Not specified')}\n"
+            )
+        if len(agent_responses) == 1:
+            # Fall back to LLM synthesis over whatever the agent returned
+            agent_payload = json.dumps(
+                {k: v for k, v in agent_responses[0].items() if k != "evidence"},
+                ensure_ascii=False, separators=(",", ":"), default=str
+            )
+            return (
+                f"{SINGLE_AGENT_SYNTHESIS_PROMPT}\n"
+                f"Query: {state['query']}\n"
+                f"Location: {state.get('location', 'Not specified')}\n"
+                f"Crop: {state.get('crop', 'Not specified')}\n"
+                f"Agent Response: {agent_payload}\n"
+            )
+        # Multiple agent responses - need LLM synthesis
+        return (
+            f"{SYNTHESIS_PROMPT}\n"
+            f"Original Query: {state['query']}\n"
+            f"Location: {state.get('location', 'Not specified')}\n"
+            f"Crop: {state.get('crop', 'Not specified')}\n\n"
+            f"Agent Responses:\n{self._synthesis_json(agent_responses)}\n"
+        )
     
-    def _validate_response(self, state: AgentState) -> AgentState:
+    @staticmethod
+    def _synthesis_confidence(agent_responses: List[Dict[str, Any]]) -> float:
+        """Mean agent confidence; a general answer without agents gets 0.3"""
+        if not agent_responses:
+            return 0.3
+        return statistics.fmean(resp.get("confidence", 0.0) for resp in agent_responses)
+    
+    @staticmethod
+    def _agent_answer(response: Dict[str, Any]) -> str:
+        """Pull the answer text out of the various agent response formats"""
+        return (
+            response.get('answer') or
+            response.get('result', {}).get('advice') or
+            response.get('response') or
+            ""
+        )
+    
+    def _synthesis_json(self, responses: List[Dict[str, Any]]) -> str:
+        """Compact JSON of only what synthesis needs; evidence lists stay out of the prompt"""
+        slim = [
+            {
+                "agent": response.get("agent", "unknown"),
+                "answer": self._agent_answer(response),
+                "confidence": response.get("confidence", 0.0),
+            }
+            for response in responses
+        ]
+        return json.dumps(slim, ensure_ascii=False, separators=(",", ":"))
+    
+    def _should_validate(self, state: AgentState) -> str:
+        """Skip the validation LLM call for a confidently routed single agent's direct answer
+        or a confident, substantive answer, unless it gives chemical or dose advice"""
+        final_answer = state.get("final_answer", "")
+        if RISK_PATTERN.search(final_answer):
+            return "validate"
+        if (
+            state.get("workflow_step") == "agent_answer"
+            and state.get("user_context", {}).get("confidence", 0.0) >= SKIP_VALIDATION_CONFIDENCE
+        ):
+            logger.debug("⏭️ SKIPPING VALIDATION: single agent answer with confident routing")
+            return "skip"
+        if state.get("confidence", 0.0) >= TRUSTED_ANSWER_CONFIDENCE and len(final_answer) > 50:
+            logger.debug("⏭️ SKIPPING VALIDATION: confident answer with no risk keywords")
+            return "skip"
+        return "validate"
+    
+    def _validate_response(self, state: AgentState) -> Dict[str, Any]:
         """Validate the final response for quality and safety"""
-        logger.info("🔍 VALIDATING RESPONSE...")
+        logger.debug("🔍 VALIDATING RESPONSE...")
         try:
             final_answer = state.get("final_answer", "")
             confidence = state.get("confidence", 0.0)
-            logger.info(f"🔍 VALIDATION INPUT: Answer length={len(final_answer)} | Confidence={confidence}")
+            logger.debug("🔍 VALIDATION INPUT: Answer length=%s | Confidence=%s", len(final_answer), confidence)
             
             # Basic validation checks
-            validation_prompt = f"""
-            Validate this agricultural advice response:
-            
-            Query: {state['query']}
-            Answer: {final_answer}
-            Confidence: {confidence}
-            
-            Check for:
-            1. Relevance to the query
-            2. Safety of recommendations
-            3. Completeness of information
-            4. Appropriate confidence level
-            
-            Respond with JSON:
-            {{
-                "is_valid": true/false,
-                "issues": ["list of issues if any"],
-                "suggested_improvements": ["list of improvements"],
-                "final_confidence": 0.0-1.0
-            }}
-            """
+            validation_prompt = (
+                f"{VALIDATION_PROMPT}\n"
+                f"Query: {state['query']}\n"
+                f"Confidence: {confidence}\n"
+                f"Answer: {final_answer}\n"
+            )
             
             validation_response = self.llm_client.generate_text(validation_prompt)
             
             try:
-                validation = json.loads(validation_response)
-            except json.JSONDecodeError:
+                validation = ResponseValidation.model_validate(
+                    _loads(self._clean_json_response(validation_response))
+                )
+            except (ValueError, ValidationError):
                 # Fallback validation
-                validation = {
-                    "is_valid": True,
-                    "issues": [],
-                    "suggested_improvements": [],
-                    "final_confidence": confidence
-                }
+                validation = ResponseValidation()
             
             # Apply validation results
-            if not validation.get("is_valid", True):
+            if not validation.is_valid:
                 # If invalid, try to improve the response
-                improvement_prompt = f"""
-                Improve this agricultural advice response:
+                improvement_prompt = (
+                    f"{IMPROVEMENT_PROMPT}\n"
+                    f"Original Query: {state['query']}\n"
+                    f"Issues: {validation.issues}\n"
+                    f"Current Answer: {final_answer}\n"
+                )
                 
-                Original Query: {state['query']}
-                Current Answer: {final_answer}
-                Issues: {validation.get('issues', [])}
-                
-                Provide an improved, safer, and more relevant response.
-                """
-                
-                improved_answer = self.llm_client.generate_text(improvement_prompt)
-                state["final_answer"] = improved_answer
+                final_answer = self.llm_client.generate_text(improvement_prompt)
             
             # Update confidence based on validation
-            state["confidence"] = validation.get("final_confidence", confidence)
-            state["workflow_step"] = "validated"
-            logger.info(f"✅ VALIDATION COMPLETE: Final confidence={state['confidence']} | Valid={validation.get('is_valid', True)}")
+            if validation.final_confidence is not None:
+                confidence = validation.final_confidence
+            logger.debug("✅ VALIDATION COMPLETE: Final confidence=%s | Valid=%s", confidence, validation.is_valid)
+            return {"final_answer": final_answer, "confidence": confidence, "workflow_step": "validated"}
             
         except Exception as e:
-            logger.error(f"❌ RESPONSE VALIDATION FAILED: {str(e)}")
-            state["error"] = f"Response validation failed: {str(e)}"
-            state["workflow_step"] = "error"
-        
-        return state
+            logger.error("❌ RESPONSE VALIDATION FAILED: %s", e)
+            return {"error": f"Response validation failed: {str(e)}", "workflow_step": "error"}
     
     def _clean_json_response(self, response: str) -> str:
         """Clean and extract JSON from LLM response"""
@@ -663,15 +791,16 @@ RESPOND WITH EXACTLY THIS JSON FORMAT:
     "priority_info": "Regional crop varieties and suitability"
 }}"""
             
-            logger.info("🤖 QUERYING LLM FOR AGENT SELECTION...")
+            logger.debug("🤖 QUERYING LLM FOR AGENT SELECTION...")
             llm_response = self.llm_client.generate_text(agent_selection_prompt)
             
-            logger.info(f"🔍 RAW LLM RESPONSE: {llm_response[:200]}...")  # Log first 200 chars for debugging
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("🔍 RAW LLM RESPONSE: %s...", llm_response[:200])  # Log first 200 chars for debugging
             
             try:
                 # Clean the JSON response
                 cleaned_json = self._clean_json_response(llm_response)
-                logger.info(f"🔍 CLEANED JSON: {cleaned_json}")
+                logger.debug("🔍 CLEANED JSON: %s", cleaned_json)
                 
                 selection_result = json.loads(cleaned_json)
                 
@@ -679,7 +808,7 @@ RESPOND WITH EXACTLY THIS JSON FORMAT:
                 reasoning = selection_result.get("reasoning", "LLM selection")
                 confidence = selection_result.get("confidence", 0.8)
                 
-                logger.info(f"🤖 LLM SELECTION: {selected_agent} | Reasoning: {reasoning} | Confidence: {confidence}")
+                logger.debug("🤖 LLM SELECTION: %s | Reasoning: %s | Confidence: %s", selected_agent, reasoning, confidence)
                 
                 # Execute the selected agent
                 if selected_agent == "weather":
@@ -706,17 +835,17 @@ RESPOND WITH EXACTLY THIS JSON FORMAT:
                 return agent_name, response
                 
             except (json.JSONDecodeError, ValueError) as e:
-                logger.warning(f"⚠️ LLM response JSON parsing failed: {str(e)}")
-                logger.warning(f"⚠️ Raw response: {llm_response}")
+                logger.warning("⚠️ LLM response JSON parsing failed: %s", e)
+                logger.warning("⚠️ Raw response: %s", llm_response)
                 return None, None
                 
         except Exception as e:
-            logger.error(f"❌ LLM AGENT SELECTION FAILED: {str(e)}")
+            logger.error("❌ LLM AGENT SELECTION FAILED: %s", e)
             return None, None
     
     def _pure_llm_agent_selection(self, query: str, location: str = None, crop: str = None, session_id: str = None) -> tuple[str, Dict[str, Any]]:
         """Pure LLM-based agent selection - no keywords, only intelligent understanding"""
-        logger.info("🧠 USING PURE LLM AGENT SELECTION")
+        logger.debug("🧠 USING PURE LLM AGENT SELECTION")
         
         # Get conversation context for better routing
         context_info = conversation_manager.get_context_for_routing(session_id) if session_id else {}
@@ -726,7 +855,7 @@ RESPOND WITH EXACTLY THIS JSON FORMAT:
         required_agents = analysis.get("required_agents", ["crop"])
         reasoning = analysis.get("reasoning", "LLM intelligent selection")
         
-        logger.info(f"🧠 LLM REASONING: {reasoning}")
+        logger.debug("🧠 LLM REASONING: %s", reasoning)
         
         # Select the first (most relevant) agent based on LLM analysis
         selected_agent = required_agents[0] if required_agents else "crop"
@@ -764,12 +893,13 @@ RESPOND WITH EXACTLY THIS JSON FORMAT:
                 "session_id": session_id
             }
         
-        logger.info(f"🧠 LLM SELECTION: {agent_name} | Reasoning: {reasoning[:50]}...")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("🧠 LLM SELECTION: %s | Reasoning: %s...", agent_name, reasoning[:50])
         return agent_name, response
     
     def _route_to_active_agent(self, active_agent: str, query: str, location: str = None, crop: str = None, session_id: str = None) -> tuple[str, Dict[str, Any]]:
         """Route query directly to the active agent in conversation"""
-        logger.info(f"🎯 ROUTING TO ACTIVE AGENT: {active_agent}")
+        logger.debug("🎯 ROUTING TO ACTIVE AGENT: %s", active_agent)
         
         try:
             # Extract base agent name (remove _agent suffix if present)
@@ -791,11 +921,11 @@ RESPOND WITH EXACTLY THIS JSON FORMAT:
                 agent_name = f"{agent_key}_agent"
                 return agent_name, response
             else:
-                logger.error(f"❌ Unknown agent: {agent_key}")
+                logger.error("❌ Unknown agent: %s", agent_key)
                 return self._pure_llm_agent_selection(query, location, crop, session_id)
                 
         except Exception as e:
-            logger.error(f"❌ ACTIVE AGENT ROUTING FAILED: {str(e)}")
+            logger.error("❌ ACTIVE AGENT ROUTING FAILED: %s", e)
             return self._pure_llm_agent_selection(query, location, crop, session_id)
     
     def _response_has_followup_questions(self, response: Dict[str, Any]) -> bool:
@@ -875,14 +1005,15 @@ RESPOND WITH EXACTLY THIS JSON FORMAT:
     "priority_info": "Farm cost analysis and optimization"
 }}"""
             
-            logger.info("🤖 QUERYING LLM FOR CONTEXT-AWARE AGENT SELECTION...")
+            logger.debug("🤖 QUERYING LLM FOR CONTEXT-AWARE AGENT SELECTION...")
             llm_response = self.llm_client.generate_text(agent_selection_prompt)
             
-            logger.info(f"🔍 RAW LLM RESPONSE: {llm_response[:200]}...")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("🔍 RAW LLM RESPONSE: %s...", llm_response[:200])
             
             try:
                 cleaned_json = self._clean_json_response(llm_response)
-                logger.info(f"🔍 CLEANED JSON: {cleaned_json}")
+                logger.debug("🔍 CLEANED JSON: %s", cleaned_json)
                 
                 selection_result = json.loads(cleaned_json)
                 
@@ -890,18 +1021,18 @@ RESPOND WITH EXACTLY THIS JSON FORMAT:
                 reasoning = selection_result.get("reasoning", "LLM selection")
                 confidence = selection_result.get("confidence", 0.8)
                 
-                logger.info(f"🤖 LLM SELECTION: {selected_agent} | Reasoning: {reasoning} | Confidence: {confidence}")
+                logger.debug("🤖 LLM SELECTION: %s | Reasoning: %s | Confidence: %s", selected_agent, reasoning, confidence)
                 
                 # Execute the selected agent with session awareness
                 return self._execute_selected_agent(selected_agent, query, location, crop, session_id, selection_result)
                 
             except (json.JSONDecodeError, ValueError) as e:
-                logger.warning(f"⚠️ LLM response JSON parsing failed: {str(e)}")
-                logger.warning(f"⚠️ Raw response: {llm_response}")
+                logger.warning("⚠️ LLM response JSON parsing failed: %s", e)
+                logger.warning("⚠️ Raw response: %s", llm_response)
                 return None, None
                 
         except Exception as e:
-            logger.error(f"❌ LLM AGENT SELECTION FAILED: {str(e)}")
+            logger.error("❌ LLM AGENT SELECTION FAILED: %s", e)
             return None, None
     
     def _execute_selected_agent(self, selected_agent: str, query: str, location: str, crop: str, session_id: str, selection_result: Dict[str, Any]) -> tuple[str, Dict[str, Any]]:
@@ -978,32 +1109,26 @@ RESPOND WITH EXACTLY THIS JSON FORMAT:
     
     async def process_query_async(self, query: str, location: str = None, crop: str = None, session_id: str = None) -> Dict[str, Any]:
         """Process a query through the supervisor workflow"""
-        logger.info(f"🚀 STARTING SUPERVISOR WORKFLOW: Query='{query}' | Location='{location or 'N/A'}' | Crop='{crop or 'N/A'}'")
+        logger.info("🚀 STARTING SUPERVISOR WORKFLOW: Query='%s' | Location='%s' | Crop='%s'", query, location or 'N/A', crop or 'N/A')
+        query_key = _normalize_query(query)
+        cache_key, cache_scope = self._response_cache_keys(query_key, location, crop)
+        final_result = await self._cached_result(query, cache_key, cache_scope)
+        if final_result is not None:
+            final_result["session_id"] = session_id
+            final_result["conversation_context"] = conversation_manager.get_context_for_routing(session_id) if session_id else None
+            return final_result
+        
         try:
-            # Initialize state
-            initial_state = AgentState(
-                query=query,
-                location=location or "",
-                crop=crop or "",
-                user_context={},
-                agent_decisions=[],
-                agent_responses=[],
-                final_answer="",
-                evidence=[],
-                confidence=0.0,
-                workflow_step="started",
-                error=""
-            )
-            
-            # Execute the workflow
-            config = {"configurable": {"thread_id": f"query_{datetime.now().timestamp()}"}}
-            logger.info("🔄 EXECUTING LANGRAPH WORKFLOW...")
-            result = await self.graph.ainvoke(initial_state, config)
-            logger.info("✅ LANGRAPH WORKFLOW COMPLETED")
+            result = await self._fast_path(query, query_key, location, crop)
+            if "final_answer" not in result:
+                # Execute the workflow
+                logger.debug("🔄 EXECUTING LANGRAPH WORKFLOW...")
+                result = await self.graph.ainvoke(result)
+                logger.debug("✅ LANGRAPH WORKFLOW COMPLETED")
             
             # Extract final result
             if result.get("error"):
-                logger.error(f"❌ WORKFLOW ERROR: {result['error']}")
+                logger.error("❌ WORKFLOW ERROR: %s", result['error'])
                 return {
                     "answer": f"I encountered an error processing your query: {result['error']}",
                     "evidence": [],
@@ -1023,11 +1148,20 @@ RESPOND WITH EXACTLY THIS JSON FORMAT:
                 "session_id": session_id if 'session_id' in locals() else None,
                 "conversation_context": conversation_manager.get_context_for_routing(session_id) if 'session_id' in locals() and session_id else None
             }
-            logger.info(f"🎉 SUPERVISOR WORKFLOW SUCCESS: Agents consulted={final_result['agents_consulted']} | Confidence={final_result['confidence']} | Workflow trace={final_result['workflow_trace']}")
+            logger.info("🎉 SUPERVISOR WORKFLOW SUCCESS: Agents consulted=%s | Confidence=%s | Workflow trace=%s", final_result['agents_consulted'], final_result['confidence'], final_result['workflow_trace'])
+            
+            # Answers built from live data are never replayed
+            if result.get("user_context", {}).get("needs_realtime"):
+                logger.debug("⏭️ NOT CACHING: query needs realtime data")
+                return final_result
+            # Session fields are per caller; everything else can be replayed
+            ttl = self._response_cache_ttl(final_result["agents_consulted"])
+            shareable = {k: v for k, v in final_result.items() if k not in ("session_id", "conversation_context")}
+            await asyncio.to_thread(self.response_cache.set, cache_key, json.dumps(shareable), ttl, query, cache_scope)
             return final_result
             
         except Exception as e:
-            logger.error(f"❌ SUPERVISOR WORKFLOW FAILED: {str(e)}")
+            logger.error("❌ SUPERVISOR WORKFLOW FAILED: %s", e)
             return {
                 "answer": f"I encountered an error: {str(e)}",
                 "evidence": [],
@@ -1037,27 +1171,137 @@ RESPOND WITH EXACTLY THIS JSON FORMAT:
                 "workflow_trace": "error"
             }
     
+    async def _fast_path(self, query: str, query_key: str, location: str, crop: str) -> AgentState:
+        """Answer an unambiguous single-intent query with one agent call and no graph.
+        
+        Returns the workflow's final state when the agent's answer can be used as is.
+        Otherwise returns the initial state for the graph, seeded with the agent's
+        response when it already ran so the graph does not run it again.
+        """
+        state = self._initial_state(query, query_key, location, crop)
+        analysis = self._fallback_query_analysis(query_key)
+        hits = analysis.get("keyword_hits", {})
+        if len(hits) != 1:
+            return state
+        (agent, count), = hits.items()
+        if count < FAST_PATH_MIN_KEYWORD_HITS or agent not in self.agents:
+            return state
+        
+        logger.debug("⚡ FAST PATH: %s keywords for %s agent", count, agent)
+        delta = await self._execute_agent(AgentTask(
+            agent=agent,
+            query=query,
+            query_key=query_key,
+            location=location,
+            crop=crop,
+            realtime=analysis["needs_realtime"]
+        ))
+        if delta.get("error"):
+            return state
+        agent_responses = delta["agent_responses"]
+        state.update(agent_responses=agent_responses, evidence=delta["evidence"], prefetched_agents=[agent])
+        answer = self._direct_agent_answer(agent_responses)
+        if answer is None:
+            return state
+        state.update(
+            final_answer=answer,
+            confidence=round(self._synthesis_confidence(agent_responses), 3),
+            workflow_step="fast_path",
+            user_context={"needs_realtime": analysis["needs_realtime"]}
+        )
+        # Chemical and dose advice is validated even when the graph is skipped
+        return await self._validate_if_risky(state)
+    
+    async def _validate_if_risky(self, state: AgentState) -> AgentState:
+        """Validate a direct answer outside the graph when it gives chemical or dose advice"""
+        if RISK_PATTERN.search(state["final_answer"]):
+            state.update(await asyncio.to_thread(self._validate_response, state))
+        return state
+    
+    async def process_query_stream(self, query: str, location: str = None, crop: str = None) -> AsyncIterator[str]:
+        """Stream the answer while it is synthesized, followed by a JSON trailer.
+        
+        Answer text chunks come first, then STREAM_TRAILER_SEPARATOR and a JSON object
+        with evidence, confidence, agents_consulted and workflow_trace. Synthesized answers
+        skip validation since text already sent cannot be revised; direct agent answers
+        with chemical or dose advice are validated before they are sent.
+        """
+        logger.info("🚀 STARTING STREAMED SUPERVISOR WORKFLOW: Query='%s' | Location='%s' | Crop='%s'", query, location or 'N/A', crop or 'N/A')
+        query_key = _normalize_query(query)
+        cache_key, cache_scope = self._response_cache_keys(query_key, location, crop)
+        result = await self._cached_result(query, cache_key, cache_scope)
+        if result is not None:
+            yield result["answer"]
+            yield self._stream_trailer(result["evidence"], result["confidence"], result["agents_consulted"], result["workflow_trace"])
+            return
+        
+        try:
+            state = await self._fast_path(query, query_key, location, crop)
+            if "final_answer" not in state:
+                state = await self.agents_graph.ainvoke(state)
+                answer = self._direct_agent_answer(state.get("agent_responses", []))
+                if answer is not None and not state.get("error"):
+                    # Nothing has been sent yet, so chemical and dose advice can still be validated
+                    state = await self._validate_if_risky({
+                        **state,
+                        "final_answer": answer,
+                        "confidence": round(self._synthesis_confidence(state["agent_responses"]), 3),
+                        "workflow_step": "agent_answer"
+                    })
+        except Exception as e:
+            logger.error("❌ STREAMED WORKFLOW FAILED: %s", e)
+            state = {"error": str(e)}
+        if state.get("error"):
+            yield f"I encountered an error processing your query: {state['error']}"
+            yield self._stream_trailer([], 0.0, [], "error")
+            return
+        
+        agent_responses = state.get("agent_responses", [])
+        if "final_answer" in state:
+            confidence = state["confidence"]
+            workflow_trace = state["workflow_step"]
+            yield state["final_answer"]
+        else:
+            confidence = round(self._synthesis_confidence(agent_responses), 3)
+            workflow_trace = "synthesized"
+            async for piece in self.llm_client.astream_text(self._synthesis_prompt(state)):
+                yield piece
+        
+        yield self._stream_trailer(
+            state.get("evidence", []),
+            confidence,
+            [resp.get("agent") for resp in agent_responses],
+            workflow_trace
+        )
+    
+    @staticmethod
+    def _stream_trailer(evidence: List[Dict[str, Any]], confidence: float, agents_consulted: List[str], workflow_trace: str) -> str:
+        return STREAM_TRAILER_SEPARATOR + json.dumps({
+            "evidence": evidence,
+            "confidence": confidence,
+            "agents_consulted": agents_consulted,
+            "agent_used": "supervisor",
+            "workflow_trace": workflow_trace
+        }, default=str)
+    
+    @staticmethod
+    def _initial_state(query: str, query_key: str, location: str, crop: str) -> AgentState:
+        # Only the inputs; every other channel starts empty and is filled by the nodes
+        return AgentState(
+            query=query,
+            query_key=query_key,
+            location=location or "",
+            crop=crop or "",
+            workflow_step="started"
+        )
+    
     def process_query(self, query: str, location: str = None, crop: str = None, session_id: str = None) -> Dict[str, Any]:
-        """Synchronous wrapper for async processing with conversation context"""
-        logger.info(f"🔄 SYNC PROCESS QUERY CALLED: Query='{query}' | Session='{session_id or 'new'}'")
+        """Blocking entry point for callers without an event loop; async callers await aprocess_query"""
+        logger.debug("🔄 SYNC PROCESS QUERY CALLED: Query='%s' | Session='%s'", query, session_id or 'new')
         try:
-            # Always use conversation-aware sync execution when session_id is provided
-            if session_id:
-                logger.info("🔄 SESSION PROVIDED: Using conversation-aware sync execution")
-                return self._process_query_sync(query, location, crop, session_id)
-            
-            # Check if we're already in an event loop for non-session queries
-            try:
-                loop = asyncio.get_running_loop()
-                # We're in an async context, so we need to handle this differently
-                logger.info("🔄 DETECTED RUNNING EVENT LOOP: Using sync execution")
-                return self._process_query_sync(query, location, crop, session_id)
-            except RuntimeError:
-                # No running loop, safe to use asyncio.run()
-                logger.info("🔄 NO RUNNING EVENT LOOP: Using async execution")
-                return asyncio.run(self.process_query_async(query, location, crop, session_id))
+            return asyncio.run(self.aprocess_query(query, location, crop, session_id))
         except Exception as e:
-            logger.error(f"❌ SYNC PROCESS QUERY FAILED: {str(e)}")
+            logger.error("❌ SYNC PROCESS QUERY FAILED: %s", e)
             return {
                 "answer": f"I encountered an error: {str(e)}",
                 "evidence": [],
@@ -1067,9 +1311,41 @@ RESPOND WITH EXACTLY THIS JSON FORMAT:
                 "workflow_trace": "error"
             }
     
+    async def aprocess_query(self, query: str, location: str = None, crop: str = None, session_id: str = None) -> Dict[str, Any]:
+        """Awaitable process_query with conversation context.
+        
+        A reply to an agent's pending follow-up goes back to that agent; every other
+        query runs the cached LangGraph workflow and is recorded on the session.
+        """
+        if not session_id:
+            return await self.process_query_async(query, location, crop)
+        # Session lookups may hit Redis; keep them off the event loop
+        is_response_to_agent, _ = await asyncio.to_thread(self._continues_conversation, session_id, query)
+        if is_response_to_agent:
+            return await asyncio.to_thread(self._process_query_sync, query, location, crop, session_id)
+        result = await self.process_query_async(query, location, crop, session_id)
+        if result.get("workflow_trace") != "error":
+            await asyncio.to_thread(self._record_interaction, session_id, query, result)
+        return result
+    
+    def _continues_conversation(self, session_id: str, query: str) -> tuple[bool, Optional[str]]:
+        """Whether the query answers the session's active agent, loading the session if needed"""
+        conversation_manager.get_or_create_context(session_id)
+        return conversation_manager.should_route_to_active_agent(session_id, query)
+    
+    def _record_interaction(self, session_id: str, query: str, result: Dict[str, Any]) -> None:
+        """Record a workflow answer so a follow-up reply reaches the agent that asked"""
+        agents = result.get("agents_consulted", [])
+        # A synthesized multi-agent answer has no single agent to continue with
+        agent_name = agents[0] if len(agents) == 1 else "supervisor"
+        # The stored response must not carry the previous turn's context along with it
+        response = {k: v for k, v in result.items() if k not in ("session_id", "conversation_context")}
+        conversation_manager.update_context(session_id, query, agent_name, response, self._response_has_followup_questions(response))
+        result["conversation_context"] = conversation_manager.get_context_for_routing(session_id)
+    
     def _process_query_sync(self, query: str, location: str = None, crop: str = None, session_id: str = None) -> Dict[str, Any]:
         """Synchronous version with conversation-aware routing"""
-        logger.info(f"🔄 SYNC EXECUTION with CONVERSATION CONTEXT: Query='{query}' | Location='{location or 'N/A'}' | Crop='{crop or 'N/A'}' | Session='{session_id or 'new'}'")
+        logger.debug("🔄 SYNC EXECUTION with CONVERSATION CONTEXT: Query='%s' | Location='%s' | Crop='%s' | Session='%s'", query, location or 'N/A', crop or 'N/A', session_id or 'new')
         
         try:
             # Get or create conversation context
@@ -1082,11 +1358,11 @@ RESPOND WITH EXACTLY THIS JSON FORMAT:
             is_response_to_agent, active_agent = conversation_manager.should_route_to_active_agent(session_id, query)
             
             if is_response_to_agent and active_agent:
-                logger.info(f"💬 CONTINUING CONVERSATION with {active_agent}")
+                logger.debug("💬 CONTINUING CONVERSATION with %s", active_agent)
                 # Route directly to the active agent without re-analysis
                 agent_name, response = self._route_to_active_agent(active_agent, query, location, crop, session_id)
             else:
-                logger.info(f"🧠 NEW CONVERSATION: Using pure LLM intelligent routing")
+                logger.debug("🧠 NEW CONVERSATION: Using pure LLM intelligent routing")
                 # Use pure LLM for intelligent agent selection - no keywords
                 agent_name, response = self._pure_llm_agent_selection(query, location, crop, session_id)
             
@@ -1112,11 +1388,11 @@ RESPOND WITH EXACTLY THIS JSON FORMAT:
                 "conversation_context": conversation_manager.get_context_for_routing(session_id) if session_id else None
             }
             
-            logger.info(f"✅ SYNC EXECUTION SUCCESS: Agent={agent_name} | Session={session_id} | Confidence={final_result['confidence']}")
+            logger.info("✅ SYNC EXECUTION SUCCESS: Agent=%s | Session=%s | Confidence=%s", agent_name, session_id, final_result['confidence'])
             return final_result
             
         except Exception as e:
-            logger.error(f"❌ SYNC EXECUTION FAILED: {str(e)}")
+            logger.error("❌ SYNC EXECUTION FAILED: %s", e)
             return {
                 "answer": f"I encountered an error: {str(e)}",
                 "evidence": [],
@@ -1125,3 +1401,17 @@ RESPOND WITH EXACTLY THIS JSON FORMAT:
                 "agent_used": "supervisor_sync",
                 "workflow_trace": "sync_error"
             }
+
+
+_supervisor: SupervisorAgent | None = None
+_supervisor_lock = threading.Lock()
+
+
+def get_supervisor() -> SupervisorAgent:
+    """Return the process-wide SupervisorAgent, creating it on first use"""
+    global _supervisor
+    if _supervisor is None:
+        with _supervisor_lock:
+            if _supervisor is None:
+                _supervisor = SupervisorAgent()
+    return _supervisor